@@ -1,63 +1,143 @@
+import functools
+import os
+import time
+
+STARTED = time.perf_counter()
+
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, no_update, Input, Output, Patch, State, ALL, MATCH
 import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
 import numpy as np
 
+from data_loader import ModelData
+from jobs import JobQueue
+from http_cache import optimize
+from metrics import Gauge, cache_ratio, instrument, mark_startup, register
+from layout_cache import LayoutCache, ResponseCache, figure_json
+from lp.sparse import CSRMatrix
+from model import (RECORD_LIMIT, evaluate_scenarios, model_version, monte_carlo, parametric_curve, scenario_grid,
+                   shared_store, solution_cache, solve_model)
+from startup import lazy_import, load_artifacts
+from tables import badge, column, data_table, page_table, register_table
+
+# plotly.express (y con él buena parte de su import) solo hace falta para el pie y la línea de convergencia
+px = lazy_import('plotly.express')
+
 # Inicializar la app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
-server = app.server
-
-# Datos
-production_data = pd.DataFrame({
-    'Producto': ['RTX 4090', 'RTX 4070', 'A100', 'H100'],
-    'Cantidad': [2000, 5000, 0, 600],
-    'Utilidad': [1698000, 1595000, 0, 9300000],
-    'Unitaria': [849, 319, 5200, 15500],
-    'Precio': [1599, 599, 10000, 30000],
-    'Costo': [750, 280, 4800, 14500],
-    'Color': ['#10b981', '#3b82f6', '#8b5cf6', '#f59e0b']
-})
-
-resource_data = pd.DataFrame({
-    'Recurso': ['Horas Fabricación', 'Empaque', 'Memoria GDDR6X', 'Memoria HBM3', 'Presupuesto'],
-    'Usado': [32000, 7600, 108000, 600, 20.2],
-    'Disponible': [50000, 35000, 150000, 1000, 45],
-    'Porcentaje': [64, 22, 72, 60, 45],
-    'Unidad': ['hrs', 'unidades', 'GB', 'GB', 'M$']
-})
-
-shadow_prices = pd.DataFrame({
-    'Recurso': ['Horas Fabricación', 'Empaque', 'GDDR6X', 'HBM3', 'Presupuesto'],
-    'Precio': [0, 0, 0, 15500, 0],
-    'Impacto': ['Nulo', 'Nulo', 'Nulo', 'Crítico', 'Nulo']
-})
-
-scenarios = pd.DataFrame({
-    'Escenario': ['Base', '+20% HBM3', '+50% HBM3', '+20% Presup.'],
-    'Utilidad': [12.59, 15.10, 19.39, 12.59],
-    'HBM3': [1000, 1200, 1500, 1000],
-    'Produccion': [7600, 8000, 8600, 7600]
-})
-
-simplex_data = pd.DataFrame({
-    'Iteracion': [0, 1, 2, 3, 4],
-    'Z': [0, 4.5, 8.75, 11.2, 12.59],
-    'x1': [0, 0, 0, 1500, 2000],
-    'x2': [0, 0, 2500, 4000, 5000],
-    'x3': [0, 0, 0, 0, 0],
-    'x4': [0, 290, 565, 580, 600]
-})
-
-sensitivity_data = pd.DataFrame({
-    'Producto': ['RTX 4090', 'RTX 4070', 'A100', 'H100'],
-    'Actual': [849, 319, 5200, 15500],
-    'Minimo': [721, 271, 0, 14000],
-    'Maximo': [977, 367, 16800, 17000],
-    'Rango': ['±15%', '±15%', 'Amplio', '±10%'],
-    'Estable': ['✓', '✓', '✗', '✓']
-})
+server = instrument(app.server)
+
+# Datos: se leen de data/ (CSV, Parquet o Feather) en el primer acceso
+model_data = ModelData()
+production_data = model_data.products
+resource_data = model_data.resources
+consumption_data = model_data.consumption
+
+# Resolver el modelo; NVIDIA_INTEGER=1 pide unidades enteras (ramificación y acotamiento al importar,
+# con hasta 30 s con catálogos grandes) y el motor sale de NVIDIA_ENGINE
+# ('simplex', 'interior', 'decomposition' o 'auto': punto interior para modelos grandes)
+INTEGER_MODE = os.environ.get('NVIDIA_INTEGER', '0') == '1'
+ENGINE = os.environ.get('NVIDIA_ENGINE', 'auto')
+solution = solve_model(production_data, resource_data, consumption_data, integer=INTEGER_MODE, engine=ENGINE)
+production_data = solution.production_data
+resource_data = solution.resource_data
+shadow_prices = solution.shadow_prices
+simplex_data = solution.simplex_data
+
+# Indicadores derivados de la solución
+total_profit = production_data['Utilidad'].sum()
+total_units = production_data['Cantidad'].sum()
+star = production_data.loc[production_data['Utilidad'].idxmax()]
+star_share = star['Utilidad'] / total_profit
+bottleneck = resource_data.loc[shadow_prices['Precio'].idxmax()]
+bottleneck_price = shadow_prices['Precio'].max()
+idle = resource_data.sort_values('Porcentaje').head(2)
+n_iterations = len(simplex_data) - 1
+# Paneles por producto: con catálogos grandes solo los RECORD_LIMIT de mayor utilidad (en su orden original)
+panel_products = production_data.nlargest(RECORD_LIMIT, 'Utilidad').sort_index()
+panel_note = (f'Mostrando los {len(panel_products)} productos de mayor utilidad de {len(production_data)}.'
+              if len(panel_products) < len(production_data) else '')
+
+
+def var_name(j):
+    return 'x' + str(j + 1).translate(str.maketrans('0123456789', '₀₁₂₃₄₅₆₇₈₉'))
+
+
+def fmt_num(value):
+    if not np.isfinite(value):
+        return '∞' if value > 0 else '-∞'
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.2f}"
+
+
+def lp_expression(cols, values, limit=RECORD_LIMIT):
+    terms = ' + '.join(('' if coef == 1 else f"{coef:g}") + var_name(j) for j, coef in zip(cols[:limit], values[:limit]))
+    return terms + (f' + … ({len(cols) - limit} términos más)' if len(cols) > limit else '')
+
+
+def constraint_row(i):
+    """Columnas y coeficientes no nulos de la fila ``i`` de A, sin densificar la matriz dispersa."""
+    A = solution.A
+    if isinstance(A, CSRMatrix):
+        start, stop = A.indptr[i], A.indptr[i + 1]
+        return A.indices[start:stop], A.data[start:stop]
+    cols = np.flatnonzero(A[i])
+    return cols, A[i, cols]
+
+
+# Escenarios sobre los dos recursos con mayor precio sombra del catálogo cargado (los que más
+# limitan la utilidad); se resuelven en lote arrancando desde la base óptima
+scenario_resources = resource_data.loc[shadow_prices['Precio'].sort_values(ascending=False, kind='stable').index[:2]]
+scenario_primary, scenario_secondary = scenario_resources.iloc[0], scenario_resources.iloc[-1]
+scenario_definitions = [
+    ('Base', {}),
+    (f"+20% {scenario_primary['Recurso']}", {scenario_primary['Recurso']: 1.2}),
+    (f"+50% {scenario_primary['Recurso']}", {scenario_primary['Recurso']: 1.5}),
+] + [(f"+20% {row['Recurso']}", {row['Recurso']: 1.2}) for _, row in scenario_resources.iloc[1:].iterrows()]
+scenarios = evaluate_scenarios(solution, scenario_definitions)
+
+# Curvas paramétricas exactas y malla de escenarios: solo se calculan al abrir la pestaña
+@functools.lru_cache(maxsize=None)
+def get_parametric_curve(resource):
+    return parametric_curve(solution, resource)
+
+
+@functools.lru_cache(maxsize=1)
+def get_scenario_grid():
+    # Los dos recursos de los escenarios entre 50% y 200%; con un solo recurso no hay malla
+    if len(scenario_resources) < 2:
+        return None
+    return scenario_grid(solution, scenario_primary['Recurso'], scenario_secondary['Recurso'],
+                         np.round(np.linspace(0.5, 2.0, 16), 2))
+
+
+# Rangos de utilidad unitaria y producto excluido más cercano a entrar al plan
+sensitivity_data = solution.sensitivity_data
+excluded = sensitivity_data[production_data['Cantidad'].to_numpy() == 0]
+entry_candidate = excluded.loc[(excluded['Maximo'] / excluded['Actual']).idxmin()] if len(excluded) else None
+
+# Versión de los datos mostrados: invalida la caché de layouts al cambiar
+data_version = model_version(production_data, resource_data, consumption_data, shadow_prices, scenarios, simplex_data, sensitivity_data)
+layout_cache = LayoutCache()
+figure_cache = LayoutCache(encode=figure_json)
+# NVIDIA_JOB_DIR guarda el estado de los trabajos en disco, visible para todos los workers
+job_queue = JobQueue(directory=os.environ.get('NVIDIA_JOB_DIR'))
+# Respuesta completa de render_content ya serializada: Dash no vuelve a codificar el layout
+TAB_PANELS = Output({'type': 'tab-panel', 'tab': ALL}, 'children')
+response_cache = ResponseCache(str(TAB_PANELS))
+cache_ratio({'layout': layout_cache, 'figure': figure_cache, 'response': response_cache, 'solution': solution_cache})
+if shared_store is not None:
+    register(Gauge('shared_store_bytes', 'Bytes de modelos y resultados en memoria compartida',
+                   lambda: {(): shared_store.nbytes()}))
+optimize(server, lambda: data_version)
+response_cache.install(server, lambda: data_version)
+# Layouts y figuras precomputados con `python startup.py` para esta versión de datos
+startup_caches = {'layouts': layout_cache, 'figures': figure_cache}
+artifact_entries = load_artifacts(data_version, startup_caches)
+
+
+def cached_figure(chart_id, builder):
+    """Figura ya validada y serializada para ``chart_id`` en la versión de datos actual."""
+    return figure_cache.get(chart_id, data_version, lambda key: builder())
 
 # Estilos
 colors = {
@@ -86,7 +166,198 @@ kpi_style = {
     'transition': 'transform 0.2s'
 }
 
+def optimality_gap():
+    return solution.integer.gap if solution.integer else 0.0
+
+ENGINE_LABELS = {'interior': 'Punto interior + crossover', 'decomposition': 'Dantzig-Wolfe + crossover'}
+
+def method_label():
+    method = ENGINE_LABELS.get(solution.result.engine, 'Simplex')
+    return f'Método: {method} + Ramificación y Acotamiento' if solution.integer else f'Método: {method}'
+
+def optimality_label():
+    if solution.integer is None:
+        return 'Optimalidad alcanzada'
+    if solution.integer.status == 'optimal':
+        return f'Óptimo entero · {solution.integer.nodes} nodos · gap 0%'
+    return f'Límite de {"nodos" if solution.integer.status == "node_limit" else "tiempo"} · gap {optimality_gap():.2%}'
+
+# Con unidades enteras los indicadores muestran el plan entero, pero precios sombra, escenarios,
+# curvas paramétricas y Monte Carlo salen de la relajación lineal: se rotulan como tales
+RELAXATION_NOTE = ('Calculado sobre la relajación lineal; la utilidad de los indicadores es la del plan entero.'
+                   if INTEGER_MODE else '')
+
+def relaxation_note():
+    return html.P(RELAXATION_NOTE, style={'fontSize': '12px', 'color': '#b45309', 'margin': '0 0 15px 0'}) if RELAXATION_NOTE else None
+
+def scenario_button_style(active):
+    return {
+        'padding': '12px 24px',
+        'borderRadius': '8px',
+        'border': 'none',
+        'fontWeight': 'bold',
+        'cursor': 'pointer',
+        'backgroundColor': colors['primary'] if active else '#f3f4f6',
+        'color': 'white' if active else '#6b7280',
+        'boxShadow': '0 2px 4px rgba(0,0,0,0.1)' if active else 'none'
+    }
+
+# Textos y estilos ya formateados de cada escenario: el navegador los intercambia sin ir al servidor
+scenario_store = {
+    'rows': [
+        {'profit': f"${row['Utilidad']:.2f}M", 'resource': f"{fmt_num(row[scenario_primary['Recurso']])} {scenario_primary['Unidad']}",
+         'units': fmt_num(row['Produccion'])}
+        for idx, row in scenarios.iterrows()
+    ],
+    'active': scenario_button_style(True),
+    'inactive': scenario_button_style(False),
+}
+
+def parametric_figure(resource):
+    return cached_figure(f'parametric-{resource}', lambda: build_parametric_figure(resource))
+
+
+def build_parametric_figure(resource):
+    curve = get_parametric_curve(resource)
+    current = resource_data.loc[resource_data['Recurso'] == resource].iloc[0]
+    unit = current['Unidad']
+    return go.Figure(data=[
+        go.Scatter(
+            x=curve.rhs, y=curve.objective / 1e6, mode='lines+markers', name='Utilidad óptima',
+            line=dict(color=colors['primary'], width=3), marker=dict(size=9),
+            hovertemplate=f'%{{x:,.2f}} {unit}<br>$%{{y:.2f}}M<extra></extra>'
+        ),
+        go.Scatter(
+            x=[current['Disponible']], y=[curve.evaluate(current['Disponible']) / 1e6], mode='markers', name='Actual',
+            marker=dict(size=14, color=colors['danger'], symbol='diamond')
+        )
+    ]).update_layout(
+        title=f'Utilidad óptima vs {resource}',
+        xaxis_title=f'{resource} disponible ({unit})',
+        yaxis_title='Utilidad (M$)',
+        height=400,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+
+def parametric_patch(resource):
+    """Cambios de la figura paramétrica al elegir otro recurso: solo trazas y títulos."""
+    curve = get_parametric_curve(resource)
+    current = resource_data.loc[resource_data['Recurso'] == resource].iloc[0]
+    unit = current['Unidad']
+    patch = Patch()
+    patch['data'][0]['x'] = curve.rhs.tolist()
+    patch['data'][0]['y'] = (curve.objective / 1e6).tolist()
+    patch['data'][0]['hovertemplate'] = f'%{{x:,.2f}} {unit}<br>$%{{y:.2f}}M<extra></extra>'
+    patch['data'][1]['x'] = [float(current['Disponible'])]
+    patch['data'][1]['y'] = [curve.evaluate(current['Disponible']) / 1e6]
+    patch['layout']['title']['text'] = f'Utilidad óptima vs {resource}'
+    patch['layout']['xaxis']['title']['text'] = f'{resource} disponible ({unit})'
+    return patch
+
+
+def parametric_note(resource):
+    curve = get_parametric_curve(resource)
+    unit = resource_data.loc[resource_data['Recurso'] == resource, 'Unidad'].iloc[0]
+    segments = [f"{fmt_num(round(lo, 2))}–{fmt_num(round(hi, 2))} {unit}: ${fmt_num(round(slope, 2))}/{unit}"
+                for lo, hi, slope in zip(curve.rhs[:-1], curve.rhs[1:], curve.slopes)]
+    return f"{len(curve.rhs) - 2} puntos de quiebre. Precio sombra por tramo — " + '; '.join(segments)
+
+# Tablas: se paginan y ordenan en el servidor a partir de los DataFrames
+def fmt_money(value):
+    return f"${fmt_num(value)}"
+
+
+register_table(
+    'production',
+    lambda: production_data.assign(
+        Contrib=production_data['Utilidad'] / total_profit * 100,
+        Status=np.where(production_data['Cantidad'] > 0, 'Producir', 'No producir')
+    ),
+    [
+        column('Producto', align='left'),
+        column('Cantidad', fmt=fmt_num),
+        column('Precio', fmt=fmt_money),
+        column('Costo', fmt=fmt_money),
+        column('Unitaria', 'Util. Unit.', fmt=fmt_money),
+        column('Utilidad', 'Utilidad Total', fmt=lambda v: f"${v/1000000:.2f}M"),
+        column('Contrib', '% Contrib.', fmt=lambda v: f"{v:.1f}%"),
+        column('Status', align='center'),
+    ],
+    [
+        {'if': {'column_id': ['Producto', 'Utilidad']}, 'fontWeight': 'bold'},
+        badge('Status', 'Producir', '#d1fae5', '#065f46'),
+        badge('Status', 'No producir', '#fee2e2', '#991b1b'),
+    ]
+)
+
+register_table(
+    'resources',
+    lambda: resource_data.assign(
+        Holgura=(resource_data['Disponible'] - resource_data['Usado']).round(2),
+        Estado=np.select([resource_data['Porcentaje'] > 80, resource_data['Porcentaje'] > 50], ['Crítico', 'Moderado'], 'Disponible'),
+        Sombra=shadow_prices['Precio'].to_numpy()
+    ),
+    [
+        column('Recurso', align='left'),
+        column('Unidad', align='left'),
+        column('Usado', fmt=fmt_num),
+        column('Disponible', fmt=fmt_num),
+        column('Holgura', fmt=fmt_num),
+        column('Porcentaje', '% Uso', fmt=lambda v: f"{v}%"),
+        column('Estado', align='center'),
+        column('Sombra', 'Precio Sombra', fmt=fmt_money),
+        column('Minimo', 'Rango Mín.', fmt=fmt_num),
+        column('Maximo', 'Rango Máx.', fmt=fmt_num),
+    ],
+    [
+        {'if': {'column_id': ['Recurso', 'Porcentaje', 'Sombra']}, 'fontWeight': 'bold'},
+        badge('Estado', 'Crítico', '#fee2e2', '#991b1b'),
+        badge('Estado', 'Moderado', '#fef3c7', '#92400e'),
+        badge('Estado', 'Disponible', '#d1fae5', '#065f46'),
+    ]
+)
+
+register_table(
+    'sensitivity',
+    lambda: sensitivity_data.assign(Estabilidad=np.where(sensitivity_data['Estable'] == '✓', 'Estable', 'Inestable')),
+    [
+        column('Producto', align='left'),
+        column('Actual', 'Utilidad Actual', fmt=fmt_money),
+        column('Minimo', 'Mínimo', fmt=fmt_money),
+        column('Maximo', 'Máximo', fmt=fmt_money),
+        column('Rango', align='center'),
+        column('Estabilidad', align='center'),
+    ],
+    [
+        {'if': {'column_id': ['Producto', 'Actual']}, 'fontWeight': 'bold'},
+        badge('Estabilidad', 'Estable', '#d1fae5', '#065f46'),
+        badge('Estabilidad', 'Inestable', '#fef3c7', '#92400e'),
+    ]
+)
+
+register_table(
+    'simplex',
+    lambda: simplex_data.assign(Estado=np.where(simplex_data['Iteracion'] == n_iterations, 'ÓPTIMO', 'Iterando')),
+    [
+        column('Iteracion', 'Iteración', align='center'),
+        column('Z', 'Z (M$)', fmt=lambda v: f"${v:.2f}M"),
+    ] + [
+        column(f'x{idx + 1}', f"{var_name(idx)} ({row['Producto']})", fmt=fmt_num)
+        for idx, row in production_data.iterrows() if f'x{idx + 1}' in simplex_data
+    ] + [
+        column('Estado', align='center'),
+    ],
+    [
+        {'if': {'filter_query': '{Estado} = "ÓPTIMO"'}, 'backgroundColor': '#d1fae5', 'fontWeight': 'bold'},
+        badge('Estado', 'ÓPTIMO', colors['primary'], 'white'),
+        badge('Estado', 'Iterando', '#dbeafe', '#1e40af'),
+    ]
+)
+
 # Layout
+TABS = ('overview', 'production', 'resources', 'sensitivity', 'simplex')
+
 app.layout = html.Div(style={'backgroundColor': colors['background'], 'padding': '20px'}, children=[
     # Header
     html.Div(style={'marginBottom': '30px'}, children=[
@@ -98,9 +369,9 @@ app.layout = html.Div(style={'backgroundColor': colors['background'], 'padding':
                       style={'color': '#6b7280', 'fontSize': '16px'})
             ]),
             html.Div(style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '10px', 'boxShadow': '0 2px 8px rgba(0,0,0,0.1)'}, children=[
-                html.P('Método: Simplex', style={'margin': '0', 'fontSize': '14px', 'color': '#6b7280'}),
-                html.P('Variables: 4 | Restricciones: 5', style={'margin': '0', 'fontSize': '14px', 'color': '#6b7280'}),
-                html.P('Optimalidad alcanzada', style={'margin': '0', 'fontSize': '14px', 'color': colors['primary'], 'fontWeight': 'bold', 'marginTop': '5px'})
+                html.P(method_label(), style={'margin': '0', 'fontSize': '14px', 'color': '#6b7280'}),
+                html.P(f'Variables: {len(production_data)} | Restricciones: {len(resource_data)}', style={'margin': '0', 'fontSize': '14px', 'color': '#6b7280'}),
+                html.P(optimality_label(), style={'margin': '0', 'fontSize': '14px', 'color': colors['primary'] if optimality_gap() <= 1e-9 else colors['warning'], 'fontWeight': 'bold', 'marginTop': '5px'})
             ])
         ]),
         
@@ -126,8 +397,13 @@ app.layout = html.Div(style={'backgroundColor': colors['background'], 'padding':
         ])
     ]),
     
-    # Content
-    html.Div(id='tab-content')
+    # Content: un panel fijo por pestaña, se llena la primera vez que se abre
+    dcc.Store(id='rendered-tabs', data=[]),
+    dcc.Store(id='pending-tab'),
+    dcc.Store(id='scenario-data', data=scenario_store),
+    html.Div(id='tab-content', children=[
+        html.Div(id={'type': 'tab-panel', 'tab': tab}, style={'display': 'none'}) for tab in TABS
+    ])
 ])
 
 # Footer
@@ -138,37 +414,33 @@ def create_footer():
         html.P('Yudid Paola Aguirre Martínez - Investigación de Operaciones', style={'margin': '5px 0'})
     ])
 
-# Callback único para cambiar contenido
-@app.callback(
-    Output('tab-content', 'children'),
-    Input('tabs', 'value')
-)
-def render_content(tab):
+# Construcción del contenido de cada pestaña
+def build_tab(tab):
     if tab == 'overview':
         return html.Div([
             # KPIs
             html.Div(style={'display': 'grid', 'gridTemplateColumns': 'repeat(auto-fit, minmax(250px, 1fr))', 'gap': '20px', 'marginBottom': '30px'}, children=[
                 html.Div(style={**kpi_style, 'borderLeftColor': colors['primary']}, children=[
                     html.P('💰 Utilidad Mensual Óptima', style={'color': '#6b7280', 'fontSize': '14px', 'margin': '0'}),
-                    html.H2('$12.59M', style={'color': colors['primary'], 'fontSize': '32px', 'margin': '10px 0'}),
+                    html.H2(f"${total_profit/1000000:.2f}M", style={'color': colors['primary'], 'fontSize': '32px', 'margin': '10px 0'}),
                     html.P('Máxima utilidad alcanzable', style={'color': '#9ca3af', 'fontSize': '12px', 'margin': '0'}),
                     html.P('📈 +100% optimizado', style={'color': colors['primary'], 'fontSize': '14px', 'fontWeight': 'bold', 'marginTop': '10px'})
                 ]),
                 html.Div(style={**kpi_style, 'borderLeftColor': colors['secondary']}, children=[
                     html.P('📦 Unidades Totales', style={'color': '#6b7280', 'fontSize': '14px', 'margin': '0'}),
-                    html.H2('7,600', style={'color': colors['secondary'], 'fontSize': '32px', 'margin': '10px 0'}),
+                    html.H2(fmt_num(total_units), style={'color': colors['secondary'], 'fontSize': '32px', 'margin': '10px 0'}),
                     html.P('Mix óptimo de producción', style={'color': '#9ca3af', 'fontSize': '12px', 'margin': '0'}),
                 ]),
                 html.Div(style={**kpi_style, 'borderLeftColor': colors['warning']}, children=[
                     html.P('🌟 Producto Estrella', style={'color': '#6b7280', 'fontSize': '14px', 'margin': '0'}),
-                    html.H2('H100', style={'color': colors['warning'], 'fontSize': '32px', 'margin': '10px 0'}),
-                    html.P('74% de la utilidad total', style={'color': '#9ca3af', 'fontSize': '12px', 'margin': '0'}),
-                    html.P('📈 $15.5K/unidad', style={'color': colors['warning'], 'fontSize': '14px', 'fontWeight': 'bold', 'marginTop': '10px'})
+                    html.H2(star['Producto'], style={'color': colors['warning'], 'fontSize': '32px', 'margin': '10px 0'}),
+                    html.P(f"{star_share*100:.0f}% de la utilidad total", style={'color': '#9ca3af', 'fontSize': '12px', 'margin': '0'}),
+                    html.P(f"📈 ${star['Unitaria']/1000:.1f}K/unidad", style={'color': colors['warning'], 'fontSize': '14px', 'fontWeight': 'bold', 'marginTop': '10px'})
                 ]),
                 html.Div(style={**kpi_style, 'borderLeftColor': colors['danger']}, children=[
                     html.P('⚠️ Cuello de Botella', style={'color': '#6b7280', 'fontSize': '14px', 'margin': '0'}),
-                    html.H2('HBM3', style={'color': colors['danger'], 'fontSize': '32px', 'margin': '10px 0'}),
-                    html.P('Precio sombra: $15.5K/GB', style={'color': '#9ca3af', 'fontSize': '12px', 'margin': '0'}),
+                    html.H2(bottleneck['Recurso'], style={'color': colors['danger'], 'fontSize': '32px', 'margin': '10px 0'}),
+                    html.P(f"Precio sombra: ${bottleneck_price/1000:.1f}K/{bottleneck['Unidad']}", style={'color': '#9ca3af', 'fontSize': '12px', 'margin': '0'}),
                 ]),
             ]),
             
@@ -177,26 +449,26 @@ def render_content(tab):
                 html.Div(style=card_style, children=[
                     html.H3('💰 Contribución a la Utilidad', style={'marginBottom': '20px', 'color': colors['text']}),
                     dcc.Graph(
-                        figure=px.pie(
+                        figure=cached_figure('overview-profit', lambda: px.pie(
                             production_data,
                             values='Utilidad',
                             names='Producto',
                             color='Producto',
-                            color_discrete_map={'RTX 4090': '#10b981', 'RTX 4070': '#3b82f6', 'A100': '#8b5cf6', 'H100': '#f59e0b'},
+                            color_discrete_map=dict(zip(production_data['Producto'], production_data['Color'])),
                             hole=0.4
                         ).update_layout(
                             showlegend=True,
                             height=400,
                             margin=dict(t=20, b=20, l=20, r=20)
-                        )
+                        ))
                     ),
-                    html.P('H100 genera 3 de cada 4 dólares de utilidad', 
+                    html.P(f"{star['Producto']} genera el {star_share*100:.0f}% de la utilidad", 
                           style={'textAlign': 'center', 'color': '#6b7280', 'fontSize': '14px', 'marginTop': '10px'})
                 ]),
                 html.Div(style=card_style, children=[
                     html.H3('📦 Mix de Producción Óptimo', style={'marginBottom': '20px', 'color': colors['text']}),
                     dcc.Graph(
-                        figure=go.Figure(data=[
+                        figure=cached_figure('overview-mix', lambda: go.Figure(data=[
                             go.Bar(
                                 x=production_data['Producto'],
                                 y=production_data['Cantidad'],
@@ -210,7 +482,7 @@ def render_content(tab):
                             showlegend=False,
                             height=400,
                             margin=dict(t=20, b=40, l=40, r=20)
-                        )
+                        ))
                     )
                 ])
             ]),
@@ -220,18 +492,18 @@ def render_content(tab):
                 html.H3('✅ Hallazgos Clave', style={'marginBottom': '20px', 'color': colors['text']}),
                 html.Div(style={'display': 'grid', 'gridTemplateColumns': 'repeat(auto-fit, minmax(250px, 1fr))', 'gap': '15px'}, children=[
                     html.Div(style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}, children=[
-                        html.H4('✓ Enfoque en H100', style={'color': colors['primary'], 'marginBottom': '10px'}),
-                        html.P('Solo 8% del volumen pero 74% de las utilidades. Máxima eficiencia de capital.',
+                        html.H4(f"✓ Enfoque en {star['Producto']}", style={'color': colors['primary'], 'marginBottom': '10px'}),
+                        html.P(f"Solo {star['Cantidad']/total_units*100:.0f}% del volumen pero {star_share*100:.0f}% de las utilidades. Máxima eficiencia de capital.",
                               style={'color': colors['text'], 'fontSize': '14px', 'margin': '0'})
                     ]),
                     html.Div(style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}, children=[
                         html.H4('⚠ Subutilización', style={'color': colors['warning'], 'marginBottom': '10px'}),
-                        html.P('78% del empaque sin usar, 55% del presupuesto disponible. Oportunidad de expansión.',
+                        html.P(', '.join(f"{100-row['Porcentaje']:.0f}% de {row['Recurso']} sin usar" for idx, row in idle.iterrows()) + '. Oportunidad de expansión.',
                               style={'color': colors['text'], 'fontSize': '14px', 'margin': '0'})
                     ]),
                     html.Div(style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}, children=[
                         html.H4('🎯 Cuello de Botella', style={'color': colors['danger'], 'marginBottom': '10px'}),
-                        html.P('Memoria HBM3 es el único limitante real. Cada GB adicional = +$15.5K utilidad.',
+                        html.P(f"{bottleneck['Recurso']} es el limitante más valioso. Cada {bottleneck['Unidad']} adicional = +${bottleneck_price/1000:.1f}K utilidad hasta {fmt_num(bottleneck['Maximo'])} {bottleneck['Unidad']}.",
                               style={'color': colors['text'], 'fontSize': '14px', 'margin': '0'})
                     ])
                 ])
@@ -244,7 +516,7 @@ def render_content(tab):
                 html.Div(style=card_style, children=[
                     html.H3('📊 Utilidad por Producto', style={'marginBottom': '20px'}),
                     dcc.Graph(
-                        figure=go.Figure(data=[
+                        figure=cached_figure('production-profit', lambda: go.Figure(data=[
                             go.Bar(
                                 y=production_data['Producto'],
                                 x=production_data['Utilidad'],
@@ -258,13 +530,13 @@ def render_content(tab):
                             yaxis_title='',
                             showlegend=False,
                             height=400
-                        )
+                        ))
                     )
                 ]),
                 html.Div(style=card_style, children=[
                     html.H3('💵 Precio vs Costo vs Utilidad', style={'marginBottom': '20px'}),
                     dcc.Graph(
-                        figure=go.Figure(data=[
+                        figure=cached_figure('production-prices', lambda: go.Figure(data=[
                             go.Bar(name='Precio', x=production_data['Producto'], y=production_data['Precio'], marker_color='#3b82f6'),
                             go.Bar(name='Costo', x=production_data['Producto'], y=production_data['Costo'], marker_color='#ef4444'),
                             go.Bar(name='Utilidad', x=production_data['Producto'], y=production_data['Unitaria'], marker_color='#10b981')
@@ -272,7 +544,7 @@ def render_content(tab):
                             barmode='group',
                             height=400,
                             legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                        )
+                        ))
                     )
                 ])
             ]),
@@ -280,67 +552,23 @@ def render_content(tab):
             # Tabla detallada
             html.Div(style=card_style, children=[
                 html.H3('📋 Detalle de Producción Óptima', style={'marginBottom': '20px'}),
-                html.Table(style={'width': '100%', 'borderCollapse': 'collapse'}, children=[
-                    html.Thead(children=[
-                        html.Tr(style={'backgroundColor': '#f3f4f6'}, children=[
-                            html.Th('Producto', style={'padding': '12px', 'textAlign': 'left', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Cantidad', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Precio', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Costo', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Util. Unit.', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Utilidad Total', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('% Contrib.', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Status', style={'padding': '12px', 'textAlign': 'center', 'borderBottom': '2px solid #e5e7eb'}),
-                        ])
-                    ]),
-                    html.Tbody(children=[
-                        html.Tr(style={'borderBottom': '1px solid #e5e7eb'}, children=[
-                            html.Td(row['Producto'], style={'padding': '12px', 'fontWeight': 'bold'}),
-                            html.Td(f"{row['Cantidad']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"${row['Precio']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"${row['Costo']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"${row['Unitaria']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"${row['Utilidad']/1000000:.2f}M", style={'padding': '12px', 'textAlign': 'right', 'fontWeight': 'bold'}),
-                            html.Td(f"{(row['Utilidad']/12593000*100):.1f}%", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(
-                                html.Span('Producir' if row['Cantidad'] > 0 else 'No producir',
-                                         style={
-                                             'padding': '5px 10px',
-                                             'borderRadius': '20px',
-                                             'fontSize': '12px',
-                                             'fontWeight': 'bold',
-                                             'backgroundColor': '#d1fae5' if row['Cantidad'] > 0 else '#fee2e2',
-                                             'color': '#065f46' if row['Cantidad'] > 0 else '#991b1b'
-                                         }),
-                                style={'padding': '12px', 'textAlign': 'center'}
-                            ),
-                        ]) for idx, row in production_data.iterrows()
-                    ] + [
-                        html.Tr(style={'backgroundColor': '#f3f4f6', 'fontWeight': 'bold'}, children=[
-                            html.Td('TOTAL', style={'padding': '12px'}),
-                            html.Td('7,600', style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td('—', style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td('—', style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td('—', style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td('$12.59M', style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td('100%', style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td('', style={'padding': '12px'}),
-                        ])
-                    ])
-                ])
+                data_table('production'),
+                html.P(f"TOTAL: {fmt_num(total_units)} unidades | ${total_profit/1000000:.2f}M | 100%",
+                       style={'padding': '12px', 'marginTop': '10px', 'backgroundColor': '#f3f4f6', 'fontWeight': 'bold', 'textAlign': 'right'})
             ]),
             
             # Cards de productos
             html.Div(style={'display': 'grid', 'gridTemplateColumns': 'repeat(auto-fit, minmax(200px, 1fr))', 'gap': '15px', 'marginTop': '20px'}, children=[
                 html.Div(style={**card_style, 'borderTop': f'4px solid {row["Color"]}'}, children=[
                     html.H4(row['Producto'], style={'marginBottom': '10px', 'color': colors['text']}),
-                    html.H2(f"{row['Cantidad']:,}", style={'margin': '5px 0', 'color': row['Color'], 'fontSize': '28px'}),
+                    html.H2(fmt_num(row['Cantidad']), style={'margin': '5px 0', 'color': row['Color'], 'fontSize': '28px'}),
                     html.P('unidades/mes', style={'fontSize': '12px', 'color': '#9ca3af', 'margin': '0'}),
                     html.Hr(style={'margin': '15px 0', 'border': 'none', 'borderTop': '1px solid #e5e7eb'}),
                     html.P(f"Utilidad: ${row['Utilidad']/1000000:.2f}M", style={'fontSize': '14px', 'margin': '5px 0'}),
                     html.P(f"Margen: {(row['Unitaria']/row['Precio']*100):.1f}%", style={'fontSize': '12px', 'color': '#6b7280', 'margin': '5px 0'})
-                ]) for idx, row in production_data.iterrows()
-            ])
+                ]) for idx, row in panel_products.iterrows()
+            ]),
+            html.P(panel_note, style={'fontSize': '12px', 'color': '#9ca3af', 'marginTop': '10px'}) if panel_note else None
         ])
     
     elif tab == 'resources':
@@ -348,7 +576,7 @@ def render_content(tab):
             html.Div(style=card_style, children=[
                 html.H3('⚡ Utilización de Recursos', style={'marginBottom': '20px'}),
                 dcc.Graph(
-                    figure=go.Figure(data=[
+                    figure=cached_figure('resources-usage', lambda: go.Figure(data=[
                         go.Bar(
                             y=resource_data['Recurso'],
                             x=resource_data['Porcentaje'],
@@ -368,13 +596,14 @@ def render_content(tab):
                         yaxis_title='',
                         showlegend=False,
                         height=400
-                    )
+                    ))
                 )
             ]),
             
             html.Div(style={'display': 'grid', 'gridTemplateColumns': 'repeat(auto-fit, minmax(500px, 1fr))', 'gap': '20px', 'marginTop': '20px'}, children=[
                 html.Div(style=card_style, children=[
                     html.H3('🔍 Precios Sombra', style={'marginBottom': '10px'}),
+                    relaxation_note(),
                     html.P('Valor marginal de cada unidad adicional de recurso', style={'fontSize': '14px', 'color': '#6b7280', 'marginBottom': '20px'}),
                     html.Div(children=[
                         html.Div(style={
@@ -390,7 +619,7 @@ def render_content(tab):
                                     html.P(f"Impacto: {row['Impacto']}", style={'fontSize': '14px', 'color': '#6b7280', 'margin': '5px 0 0 0'})
                                 ]),
                                 html.Div(style={'textAlign': 'right'}, children=[
-                                    html.H3(f"${row['Precio']:,}", style={
+                                    html.H3(f"${fmt_num(row['Precio'])}", style={
                                         'margin': '0',
                                         'color': '#ef4444' if row['Precio'] > 0 else '#9ca3af',
                                         'fontSize': '24px'
@@ -405,7 +634,7 @@ def render_content(tab):
                 html.Div(style=card_style, children=[
                     html.H3('📊 Perfil de Utilización', style={'marginBottom': '20px'}),
                     dcc.Graph(
-                        figure=go.Figure(data=go.Scatterpolar(
+                        figure=cached_figure('resources-profile', lambda: go.Figure(data=go.Scatterpolar(
                             r=resource_data['Porcentaje'],
                             theta=resource_data['Recurso'],
                             fill='toself',
@@ -417,7 +646,7 @@ def render_content(tab):
                             ),
                             showlegend=False,
                             height=400
-                        )
+                        ))
                     )
                 ])
             ]),
@@ -425,149 +654,95 @@ def render_content(tab):
             # Tabla de recursos
             html.Div(style=card_style, children=[
                 html.H3('📋 Detalle de Recursos', style={'marginBottom': '20px'}),
-                html.Table(style={'width': '100%', 'borderCollapse': 'collapse'}, children=[
-                    html.Thead(children=[
-                        html.Tr(style={'backgroundColor': '#f3f4f6'}, children=[
-                            html.Th('Recurso', style={'padding': '12px', 'textAlign': 'left', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Usado', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Disponible', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Holgura', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('% Uso', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Estado', style={'padding': '12px', 'textAlign': 'center', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Precio Sombra', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                        ])
-                    ]),
-                    html.Tbody(children=[
-                        html.Tr(style={'borderBottom': '1px solid #e5e7eb'}, children=[
-                            html.Td(row['Recurso'], style={'padding': '12px', 'fontWeight': 'bold'}),
-                            html.Td(f"{row['Usado']:,} {row['Unidad']}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"{row['Disponible']:,} {row['Unidad']}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"{(row['Disponible']-row['Usado']):,} {row['Unidad']}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"{row['Porcentaje']}%", style={'padding': '12px', 'textAlign': 'right', 'fontWeight': 'bold'}),
-                            html.Td(
-                                html.Span(
-                                    'Crítico' if row['Porcentaje'] > 80 else 'Moderado' if row['Porcentaje'] > 50 else 'Disponible',
-                                    style={
-                                        'padding': '5px 10px',
-                                        'borderRadius': '20px',
-                                        'fontSize': '12px',
-                                        'fontWeight': 'bold',
-                                        'backgroundColor': '#fee2e2' if row['Porcentaje'] > 80 else '#fef3c7' if row['Porcentaje'] > 50 else '#d1fae5',
-                                        'color': '#991b1b' if row['Porcentaje'] > 80 else '#92400e' if row['Porcentaje'] > 50 else '#065f46'
-                                    }
-                                ),
-                                style={'padding': '12px', 'textAlign': 'center'}
-                            ),
-                            html.Td(f"${shadow_prices.iloc[idx]['Precio']:,}", style={'padding': '12px', 'textAlign': 'right', 'fontWeight': 'bold'}),
-                        ]) for idx, row in resource_data.iterrows()
-                    ])
-                ])
+                data_table('resources')
             ])
         ])
     
     elif tab == 'sensitivity':
+        scenario_grid_data = get_scenario_grid()
         return html.Div([
             html.Div(style=card_style, children=[
                 html.H3('📈 Análisis de Escenarios', style={'marginBottom': '20px'}),
+                relaxation_note(),
                 html.Div(style={'display': 'flex', 'gap': '10px', 'marginBottom': '20px', 'flexWrap': 'wrap'}, children=[
                     html.Button(
                         row['Escenario'],
                         id={'type': 'scenario-btn', 'index': idx},
                         n_clicks=0,
-                        style={
-                            'padding': '12px 24px',
-                            'borderRadius': '8px',
-                            'border': 'none',
-                            'fontWeight': 'bold',
-                            'cursor': 'pointer',
-                            'backgroundColor': colors['primary'] if idx == 0 else '#f3f4f6',
-                            'color': 'white' if idx == 0 else '#6b7280',
-                            'boxShadow': '0 2px 4px rgba(0,0,0,0.1)' if idx == 0 else 'none'
-                        }
+                        style=scenario_button_style(idx == 0)
                     ) for idx, row in scenarios.iterrows()
                 ]),
                 
                 html.Div(style={'display': 'grid', 'gridTemplateColumns': 'repeat(auto-fit, minmax(250px, 1fr))', 'gap': '15px'}, children=[
                     html.Div(style={'background': 'linear-gradient(135deg, #d1fae5 0%, #a7f3d0 100%)', 'padding': '20px', 'borderRadius': '10px'}, children=[
                         html.P('💰 Utilidad Proyectada', style={'color': '#6b7280', 'fontSize': '14px', 'margin': '0 0 10px 0'}),
-                        html.H2(f"${scenarios.iloc[0]['Utilidad']}M", style={'color': colors['primary'], 'fontSize': '32px', 'margin': '0'}),
+                        html.H2(f"${scenarios.iloc[0]['Utilidad']:.2f}M", id='scenario-profit', style={'color': colors['primary'], 'fontSize': '32px', 'margin': '0'}),
                     ]),
                     html.Div(style={'background': 'linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%)', 'padding': '20px', 'borderRadius': '10px'}, children=[
-                        html.P('🧠 Memoria HBM3', style={'color': '#6b7280', 'fontSize': '14px', 'margin': '0 0 10px 0'}),
-                        html.H2(f"{scenarios.iloc[0]['HBM3']} GB", style={'color': colors['secondary'], 'fontSize': '32px', 'margin': '0'}),
+                        html.P(f"⚙️ {scenario_primary['Recurso']}", style={'color': '#6b7280', 'fontSize': '14px', 'margin': '0 0 10px 0'}),
+                        html.H2(scenario_store['rows'][0]['resource'], id='scenario-resource', style={'color': colors['secondary'], 'fontSize': '32px', 'margin': '0'}),
                     ]),
                     html.Div(style={'background': 'linear-gradient(135deg, #e9d5ff 0%, #d8b4fe 100%)', 'padding': '20px', 'borderRadius': '10px'}, children=[
                         html.P('📦 Producción Total', style={'color': '#6b7280', 'fontSize': '14px', 'margin': '0 0 10px 0'}),
-                        html.H2(f"{scenarios.iloc[0]['Produccion']:,}", style={'color': '#8b5cf6', 'fontSize': '32px', 'margin': '0'}),
+                        html.H2(fmt_num(scenarios.iloc[0]['Produccion']), id='scenario-units', style={'color': '#8b5cf6', 'fontSize': '32px', 'margin': '0'}),
                     ]),
                 ])
             ]),
             
             html.Div(style=card_style, children=[
                 html.H3('📊 Comparación de Escenarios', style={'marginBottom': '20px'}),
+                dcc.Dropdown(
+                    id='parametric-resource',
+                    options=[{'label': resource, 'value': resource} for resource in resource_data['Recurso']],
+                    value=bottleneck['Recurso'],
+                    clearable=False,
+                    style={'maxWidth': '320px', 'marginBottom': '10px'}
+                ),
+                dcc.Graph(id='parametric-graph', figure=parametric_figure(bottleneck['Recurso'])),
+                html.P(parametric_note(bottleneck['Recurso']), id='parametric-note',
+                       style={'fontSize': '14px', 'color': '#6b7280', 'marginTop': '10px'})
+            ]),
+            
+            html.Div(style=card_style, children=[
+                html.H3('🗺️ Malla de Escenarios', style={'marginBottom': '10px'}),
+                html.P(f"Utilidad óptima (M$) de {scenario_grid_data.size} escenarios resueltos en lote desde la base óptima",
+                       style={'fontSize': '14px', 'color': '#6b7280', 'marginBottom': '20px'}),
                 dcc.Graph(
-                    figure=px.line(
-                        scenarios,
-                        x='Escenario',
-                        y='Utilidad',
-                        markers=True,
-                        title='Utilidad por Escenario'
-                    ).update_traces(
-                        line=dict(color=colors['primary'], width=3),
-                        marker=dict(size=10)
-                    ).update_layout(
-                        xaxis_title='',
-                        yaxis_title='Utilidad (M$)',
-                        height=400
-                    )
+                    figure=cached_figure('scenario-grid', lambda: go.Figure(data=go.Heatmap(
+                        z=scenario_grid_data.to_numpy(),
+                        x=[f"{f:.0%}" for f in scenario_grid_data.columns],
+                        y=[f"{f:.0%}" for f in scenario_grid_data.index],
+                        colorscale=[[0, '#fee2e2'], [0.5, '#fef3c7'], [1, '#10b981']],
+                        colorbar=dict(title='M$')
+                    )).update_layout(
+                        xaxis_title=f"{scenario_secondary['Recurso']} disponible",
+                        yaxis_title=f"{scenario_primary['Recurso']} disponible",
+                        height=450
+                    ))
                 )
-            ]),
+            ]) if scenario_grid_data is not None else None,
             
+            html.Div(style=card_style, children=[
+                html.H3('🎲 Robustez del Plan (Monte Carlo)', style={'marginBottom': '10px'}),
+                # Los sorteos corren en la cola de trabajos; el sondeo llena la tarjeta al terminar
+                html.Div(id='monte-carlo-body', children=html.P('Calculando sorteos...', style={'fontSize': '14px', 'color': '#6b7280'})),
+                dcc.Interval(id='monte-carlo-poll', interval=1000)
+            ]),
+
             html.Div(style=card_style, children=[
                 html.H3('📋 Rangos de Estabilidad - Utilidades Unitarias', style={'marginBottom': '20px'}),
-                html.Table(style={'width': '100%', 'borderCollapse': 'collapse'}, children=[
-                    html.Thead(children=[
-                        html.Tr(style={'backgroundColor': '#f3f4f6'}, children=[
-                            html.Th('Producto', style={'padding': '12px', 'textAlign': 'left', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Utilidad Actual', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Mínimo', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Máximo', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Rango', style={'padding': '12px', 'textAlign': 'center', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Estabilidad', style={'padding': '12px', 'textAlign': 'center', 'borderBottom': '2px solid #e5e7eb'}),
-                        ])
-                    ]),
-                    html.Tbody(children=[
-                        html.Tr(style={'borderBottom': '1px solid #e5e7eb'}, children=[
-                            html.Td(row['Producto'], style={'padding': '12px', 'fontWeight': 'bold'}),
-                            html.Td(f"${row['Actual']:,}", style={'padding': '12px', 'textAlign': 'right', 'fontWeight': 'bold'}),
-                            html.Td(f"${row['Minimo']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"${row['Maximo']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(row['Rango'], style={'padding': '12px', 'textAlign': 'center'}),
-                            html.Td(
-                                html.Span(
-                                    'Estable' if row['Estable'] == '✓' else 'Inestable',
-                                    style={
-                                        'padding': '5px 10px',
-                                        'borderRadius': '20px',
-                                        'fontSize': '12px',
-                                        'fontWeight': 'bold',
-                                        'backgroundColor': '#d1fae5' if row['Estable'] == '✓' else '#fef3c7',
-                                        'color': '#065f46' if row['Estable'] == '✓' else '#92400e'
-                                    }
-                                ),
-                                style={'padding': '12px', 'textAlign': 'center'}
-                            ),
-                        ]) for idx, row in sensitivity_data.iterrows()
-                    ])
-                ]),
+                data_table('sensitivity'),
                 html.Div(style={'marginTop': '20px', 'padding': '15px', 'backgroundColor': '#dbeafe', 'borderRadius': '8px'}, children=[
                     html.P([
                         html.Strong('Nota: '),
-                        'El A100 necesitaría una utilidad unitaria de ',
-                        html.Strong('$16,800'),
-                        ' (vs actual $5,200) para entrar en el plan óptimo. Un incremento de ',
-                        html.Strong('+223%'),
+                        f"El {entry_candidate['Producto']} necesitaría una utilidad unitaria de ",
+                        html.Strong(f"${fmt_num(entry_candidate['Maximo'])}"),
+                        f" (vs actual ${fmt_num(entry_candidate['Actual'])}) para entrar en el plan óptimo. Un incremento de ",
+                        html.Strong(f"+{entry_candidate['Maximo'] / entry_candidate['Actual'] - 1:.0%}"),
                         '.'
+                    ] if entry_candidate is not None else [
+                        html.Strong('Nota: '),
+                        'Todos los productos forman parte del plan óptimo.'
                     ], style={'margin': '0', 'fontSize': '14px', 'color': colors['text']})
                 ])
             ]),
@@ -575,17 +750,17 @@ def render_content(tab):
             html.Div(style=card_style, children=[
                 html.H3('📊 Visualización de Rangos de Sensibilidad', style={'marginBottom': '20px'}),
                 dcc.Graph(
-                    figure=go.Figure(data=[
+                    figure=cached_figure('sensitivity-ranges', lambda: go.Figure(data=[
                         go.Bar(name='Mínimo', x=sensitivity_data['Producto'], y=sensitivity_data['Minimo'], marker_color='#ef4444'),
                         go.Bar(name='Actual', x=sensitivity_data['Producto'], y=sensitivity_data['Actual'], marker_color='#3b82f6'),
-                        go.Bar(name='Máximo', x=sensitivity_data['Producto'], y=sensitivity_data['Maximo'], marker_color='#10b981')
+                        go.Bar(name='Máximo', x=sensitivity_data['Producto'], y=sensitivity_data['Maximo'].replace(np.inf, np.nan), marker_color='#10b981')
                     ]).update_layout(
                         barmode='group',
                         xaxis_title='',
                         yaxis_title='Utilidad Unitaria ($)',
                         height=400,
                         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                    )
+                    ))
                 )
             ])
         ])
@@ -595,7 +770,7 @@ def render_content(tab):
             html.Div(style=card_style, children=[
                 html.H3('🔢 Convergencia del Método Simplex', style={'marginBottom': '20px'}),
                 dcc.Graph(
-                    figure=px.line(
+                    figure=cached_figure('simplex-convergence', lambda: px.line(
                         simplex_data,
                         x='Iteracion',
                         y='Z',
@@ -608,75 +783,47 @@ def render_content(tab):
                         xaxis_title='Iteración',
                         yaxis_title='Utilidad (M$)',
                         height=400
-                    )
+                    ))
                 ),
                 html.Div(style={'marginTop': '15px', 'padding': '15px', 'backgroundColor': '#d1fae5', 'borderRadius': '8px'}, children=[
                     html.P([
                         'El algoritmo Simplex convergió en ',
-                        html.Strong('4 iteraciones'),
+                        html.Strong(f'{n_iterations} iteraciones'),
                         ', alcanzando la solución óptima de ',
-                        html.Strong('$12.59M'),
+                        html.Strong(f"${total_profit/1000000:.2f}M"),
                         ' de utilidad mensual.'
                     ], style={'margin': '0', 'fontSize': '14px', 'color': colors['text']})
                 ])
             ]),
             
+            html.Div(style=card_style, children=[
+                html.H3('⏳ Resolución en Segundo Plano', style={'marginBottom': '10px'}),
+                html.P('Vuelve a leer los archivos del modelo y lo resuelve fuera del servidor web; un modelo ya resuelto no se vuelve a calcular.',
+                       style={'fontSize': '14px', 'color': '#6b7280', 'marginBottom': '15px'}),
+                html.Button('Resolver modelo', id='solve-btn', n_clicks=0, style=scenario_button_style(True)),
+                html.P(id='solve-status', style={'fontSize': '14px', 'color': colors['text'], 'marginTop': '15px'}),
+                dcc.Store(id='solve-job'),
+                dcc.Interval(id='solve-poll', interval=500, disabled=True)
+            ]),
+
             html.Div(style=card_style, children=[
                 html.H3('📈 Evolución de Variables por Iteración', style={'marginBottom': '20px'}),
                 dcc.Graph(
-                    figure=go.Figure(data=[
-                        go.Scatter(x=simplex_data['Iteracion'], y=simplex_data['x1'], mode='lines+markers', name='RTX 4090 (x₁)', line=dict(color='#10b981', width=2)),
-                        go.Scatter(x=simplex_data['Iteracion'], y=simplex_data['x2'], mode='lines+markers', name='RTX 4070 (x₂)', line=dict(color='#3b82f6', width=2)),
-                        go.Scatter(x=simplex_data['Iteracion'], y=simplex_data['x3'], mode='lines+markers', name='A100 (x₃)', line=dict(color='#8b5cf6', width=2)),
-                        go.Scatter(x=simplex_data['Iteracion'], y=simplex_data['x4'], mode='lines+markers', name='H100 (x₄)', line=dict(color='#f59e0b', width=2))
+                    figure=cached_figure('simplex-variables', lambda: go.Figure(data=[
+                        go.Scatter(x=simplex_data['Iteracion'], y=simplex_data[f'x{idx + 1}'], mode='lines+markers', name=f"{row['Producto']} ({var_name(idx)})", line=dict(color=row['Color'], width=2))
+                        for idx, row in production_data.iterrows() if f'x{idx + 1}' in simplex_data
                     ]).update_layout(
                         xaxis_title='Iteración',
                         yaxis_title='Cantidad',
                         height=400,
                         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                    )
+                    ))
                 )
             ]),
             
             html.Div(style=card_style, children=[
                 html.H3('📋 Tabla de Iteraciones del Simplex', style={'marginBottom': '20px'}),
-                html.Table(style={'width': '100%', 'borderCollapse': 'collapse'}, children=[
-                    html.Thead(children=[
-                        html.Tr(style={'backgroundColor': '#f3f4f6'}, children=[
-                            html.Th('Iteración', style={'padding': '12px', 'textAlign': 'center', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Z (M$)', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('x₁ (4090)', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('x₂ (4070)', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('x₃ (A100)', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('x₄ (H100)', style={'padding': '12px', 'textAlign': 'right', 'borderBottom': '2px solid #e5e7eb'}),
-                            html.Th('Estado', style={'padding': '12px', 'textAlign': 'center', 'borderBottom': '2px solid #e5e7eb'}),
-                        ])
-                    ]),
-                    html.Tbody(children=[
-                        html.Tr(style={'borderBottom': '1px solid #e5e7eb', 'backgroundColor': '#d1fae5' if idx == len(simplex_data) - 1 else 'white', 'fontWeight': 'bold' if idx == len(simplex_data) - 1 else 'normal'}, children=[
-                            html.Td(str(row['Iteracion']), style={'padding': '12px', 'textAlign': 'center'}),
-                            html.Td(f"${row['Z']:.2f}M", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"{row['x1']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"{row['x2']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"{row['x3']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(f"{row['x4']:,}", style={'padding': '12px', 'textAlign': 'right'}),
-                            html.Td(
-                                html.Span(
-                                    'ÓPTIMO' if idx == len(simplex_data) - 1 else 'Iterando',
-                                    style={
-                                        'padding': '5px 10px',
-                                        'borderRadius': '20px',
-                                        'fontSize': '12px',
-                                        'fontWeight': 'bold',
-                                        'backgroundColor': colors['primary'] if idx == len(simplex_data) - 1 else '#dbeafe',
-                                        'color': 'white' if idx == len(simplex_data) - 1 else '#1e40af'
-                                    }
-                                ),
-                                style={'padding': '12px', 'textAlign': 'center'}
-                            ),
-                        ]) for idx, row in simplex_data.iterrows()
-                    ])
-                ])
+                data_table('simplex', page_size=25, virtualized=True)
             ]),
             
             html.Div(style={'display': 'grid', 'gridTemplateColumns': 'repeat(auto-fit, minmax(400px, 1fr))', 'gap': '20px', 'marginTop': '20px'}, children=[
@@ -684,16 +831,18 @@ def render_content(tab):
                     html.H4('🔍 Modelo Matemático', style={'marginBottom': '15px', 'color': colors['text']}),
                     html.Div(style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px'}, children=[
                         html.P('Función Objetivo:', style={'fontWeight': 'bold', 'color': colors['secondary'], 'marginBottom': '10px'}),
-                        html.P('max Z = 849x₁ + 319x₂ + 5200x₃ + 15500x₄', style={'fontFamily': 'monospace', 'fontSize': '12px', 'marginBottom': '15px'}),
+                        html.P(f"max Z = {lp_expression(np.flatnonzero(solution.c), solution.c[solution.c != 0])}", style={'fontFamily': 'monospace', 'fontSize': '12px', 'marginBottom': '15px'}),
                         
                         html.P('Restricciones:', style={'fontWeight': 'bold', 'color': colors['secondary'], 'marginBottom': '10px'}),
                         html.Div(style={'fontFamily': 'monospace', 'fontSize': '11px'}, children=[
-                            html.P('8x₁ + 5x₂ + 12x₃ + 15x₄ ≤ 50,000', style={'margin': '5px 0'}),
-                            html.P('x₁ + x₂ + x₃ + x₄ ≤ 35,000', style={'margin': '5px 0'}),
-                            html.P('24x₁ + 12x₂ ≤ 150,000', style={'margin': '5px 0'}),
-                            html.P('x₃ + x₄ ≤ 1,000', style={'margin': '5px 0'}),
-                            html.P('750x₁ + 280x₂ + 4800x₃ + 14500x₄ ≤ 45,000,000', style={'margin': '5px 0'}),
-                            html.P('x₁, x₂, x₃, x₄ ≥ 0', style={'margin': '5px 0'})
+                            html.P(f"{lp_expression(*constraint_row(i))} ≤ {fmt_num(solution.b[i])}", style={'margin': '5px 0'})
+                            for i in range(min(len(solution.b), RECORD_LIMIT))
+                        ] + [
+                            html.P(f'… y {len(solution.b) - RECORD_LIMIT} restricciones más', style={'margin': '5px 0'})
+                            for _ in range(len(solution.b) > RECORD_LIMIT)
+                        ] + [
+                            html.P((', '.join(var_name(j) for j in range(len(solution.c))) if len(solution.c) <= RECORD_LIMIT
+                                    else f'{var_name(0)}, …, {var_name(len(solution.c) - 1)}') + ' ≥ 0', style={'margin': '5px 0'})
                         ])
                     ])
                 ]),
@@ -703,26 +852,15 @@ def render_content(tab):
                     html.Div(style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px'}, children=[
                         html.P('Variables de Decisión:', style={'fontSize': '14px', 'color': '#6b7280', 'marginBottom': '15px'}),
                         html.Div(style={'display': 'grid', 'gridTemplateColumns': '1fr 1fr', 'gap': '10px', 'marginBottom': '15px'}, children=[
-                            html.Div(style={'backgroundColor': '#d1fae5', 'padding': '10px', 'borderRadius': '8px'}, children=[
-                                html.P('x₁ (RTX 4090)', style={'fontSize': '12px', 'color': '#6b7280', 'margin': '0'}),
-                                html.P('2,000', style={'fontSize': '18px', 'fontWeight': 'bold', 'color': colors['primary'], 'margin': '5px 0 0 0'})
-                            ]),
-                            html.Div(style={'backgroundColor': '#dbeafe', 'padding': '10px', 'borderRadius': '8px'}, children=[
-                                html.P('x₂ (RTX 4070)', style={'fontSize': '12px', 'color': '#6b7280', 'margin': '0'}),
-                                html.P('5,000', style={'fontSize': '18px', 'fontWeight': 'bold', 'color': colors['secondary'], 'margin': '5px 0 0 0'})
-                            ]),
-                            html.Div(style={'backgroundColor': '#e9d5ff', 'padding': '10px', 'borderRadius': '8px'}, children=[
-                                html.P('x₃ (A100)', style={'fontSize': '12px', 'color': '#6b7280', 'margin': '0'}),
-                                html.P('0', style={'fontSize': '18px', 'fontWeight': 'bold', 'color': '#8b5cf6', 'margin': '5px 0 0 0'})
-                            ]),
-                            html.Div(style={'backgroundColor': '#fed7aa', 'padding': '10px', 'borderRadius': '8px'}, children=[
-                                html.P('x₄ (H100)', style={'fontSize': '12px', 'color': '#6b7280', 'margin': '0'}),
-                                html.P('600', style={'fontSize': '18px', 'fontWeight': 'bold', 'color': colors['warning'], 'margin': '5px 0 0 0'})
-                            ])
+                            html.Div(style={'backgroundColor': row['Color'] + '22', 'padding': '10px', 'borderRadius': '8px'}, children=[
+                                html.P(f"{var_name(idx)} ({row['Producto']})", style={'fontSize': '12px', 'color': '#6b7280', 'margin': '0'}),
+                                html.P(fmt_num(row['Cantidad']), style={'fontSize': '18px', 'fontWeight': 'bold', 'color': row['Color'], 'margin': '5px 0 0 0'})
+                            ]) for idx, row in panel_products.iterrows()
                         ]),
+                        html.P(panel_note, style={'fontSize': '12px', 'color': '#9ca3af', 'margin': '0 0 15px 0'}) if panel_note else None,
                         html.Div(style={'paddingTop': '15px', 'borderTop': '1px solid #e5e7eb'}, children=[
                             html.P('Utilidad Máxima:', style={'fontSize': '14px', 'color': '#6b7280', 'margin': '0'}),
-                            html.H2('$12.59M', style={'color': colors['primary'], 'fontSize': '32px', 'margin': '10px 0 0 0'})
+                            html.H2(f"${total_profit/1000000:.2f}M", style={'color': colors['primary'], 'fontSize': '32px', 'margin': '10px 0 0 0'})
                         ])
                     ])
                 ])
@@ -738,17 +876,18 @@ def render_content(tab):
                     ]),
                     html.Div(style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}, children=[
                         html.H4('✅ Variables Básicas', style={'color': '#8b5cf6', 'marginBottom': '10px', 'fontSize': '16px'}),
-                        html.P('En la solución óptima, las variables básicas son x₁, x₂ y x₄. La variable x₃ (A100) permanece en cero, indicando que no es rentable producirla.',
+                        html.P(f"En la solución óptima, las variables en producción son {', '.join(var_name(idx) for idx in panel_products.index[panel_products['Cantidad'] > 0])}. "
+                               + ''.join(f"La variable {var_name(idx)} ({row['Producto']}) permanece en cero, indicando que no es rentable producirla. " for idx, row in panel_products[panel_products['Cantidad'] == 0].iterrows()),
                               style={'color': colors['text'], 'fontSize': '14px', 'margin': '0', 'lineHeight': '1.6'})
                     ]),
                     html.Div(style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}, children=[
                         html.H4('📈 Mejora Progresiva', style={'color': '#8b5cf6', 'marginBottom': '10px', 'fontSize': '16px'}),
-                        html.P('Cada iteración incrementó Z significativamente: de $0 a $4.5M (+∞%), luego a $8.75M (+94%), a $11.2M (+28%), y finalmente a $12.59M (+12%).',
+                        html.P('Evolución de Z por iteración: ' + ' → '.join(f"${z:.2f}M" for z in simplex_data['Z']) + '.',
                               style={'color': colors['text'], 'fontSize': '14px', 'margin': '0', 'lineHeight': '1.6'})
                     ]),
                     html.Div(style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '10px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}, children=[
                         html.H4('🎯 Optimalidad', style={'color': '#8b5cf6', 'marginBottom': '10px', 'fontSize': '16px'}),
-                        html.P('El criterio de optimalidad se cumplió en la iteración 4: todos los costos reducidos son no-positivos, garantizando que no existe mejor solución.',
+                        html.P(f'El criterio de optimalidad se cumplió en la iteración {n_iterations}: todos los costos reducidos son no-positivos, garantizando que no existe mejor solución.',
                               style={'color': colors['text'], 'fontSize': '14px', 'margin': '0', 'lineHeight': '1.6'})
                     ])
                 ])
@@ -759,6 +898,193 @@ def render_content(tab):
     content = html.Div([content, create_footer()])
     return content
 
+# Cambio de pestaña en el navegador: muestra el panel y solo pide al servidor los que faltan
+app.clientside_callback(
+    """
+    function(tab, rendered, panels) {
+        const styles = panels.map(id => ({display: id.tab === tab ? 'block' : 'none'}));
+        if (rendered.includes(tab)) {
+            return [styles, window.dash_clientside.no_update, window.dash_clientside.no_update];
+        }
+        return [styles, rendered.concat([tab]), tab];
+    }
+    """,
+    Output({'type': 'tab-panel', 'tab': ALL}, 'style'),
+    Output('rendered-tabs', 'data'),
+    Output('pending-tab', 'data'),
+    Input('tabs', 'value'),
+    State('rendered-tabs', 'data'),
+    State({'type': 'tab-panel', 'tab': ALL}, 'id')
+)
+
+# Contenido de una pestaña: se construye una vez por versión de datos y se envía una vez por sesión
+@app.callback(
+    TAB_PANELS,
+    Input('pending-tab', 'data'),
+    prevent_initial_call=True
+)
+def render_content(tab):
+    return [layout_cache.get(tab, data_version, build_tab) if name == tab else no_update for name in TABS]
+
+# Paginación y orden de las tablas del lado del servidor
+@app.callback(
+    Output({'type': 'data-table', 'table': MATCH}, 'data'),
+    Input({'type': 'data-table', 'table': MATCH}, 'page_current'),
+    Input({'type': 'data-table', 'table': MATCH}, 'page_size'),
+    Input({'type': 'data-table', 'table': MATCH}, 'sort_by'),
+    State({'type': 'data-table', 'table': MATCH}, 'id')
+)
+def update_table(page_current, page_size, sort_by, table_id):
+    return page_table(table_id['table'], page_current, page_size, sort_by)
+
+# Curva paramétrica del recurso elegido
+@app.callback(
+    Output('parametric-graph', 'figure'),
+    Output('parametric-note', 'children'),
+    Input('parametric-resource', 'value')
+)
+def update_parametric(resource):
+    return parametric_patch(resource), parametric_note(resource)
+
+# Resolución en segundo plano: el trabajo se identifica con la huella de los datos
+def solve_summary(solution):
+    """Lo que muestra el sondeo, guardado en el estado del trabajo para que lo lea cualquier worker."""
+    return {'objective': float(solution.result.objective), 'iterations': int(solution.result.iterations)}
+
+
+@app.callback(
+    Output('solve-job', 'data'),
+    Output('solve-poll', 'disabled'),
+    Input('solve-btn', 'n_clicks'),
+    prevent_initial_call=True
+)
+def submit_solve(n_clicks):
+    data = ModelData(model_data.data_dir)
+    key = model_version(data.products, data.resources, data.consumption)
+    job_queue.submit(key, solve_model, data.products, data.resources, data.consumption,
+                     integer=INTEGER_MODE, engine=ENGINE, summarize=solve_summary)
+    return key, False
+
+
+@app.callback(
+    Output('solve-status', 'children'),
+    Output('solve-poll', 'disabled', allow_duplicate=True),
+    Input('solve-poll', 'n_intervals'),
+    State('solve-job', 'data'),
+    prevent_initial_call=True
+)
+def poll_solve(n_intervals, key):
+    status = job_queue.status(key)
+    if status is None:
+        return 'Trabajo no encontrado.', True
+    if status['status'] == 'failed':
+        return f"Error: {status['error']}", True
+    if status['status'] == 'done':
+        result = status.get('result')
+        if result is None:
+            return 'Publicando resultado...', False
+        return f"Óptimo: ${result['objective'] / 1e6:.2f}M en {result['iterations']} iteraciones (modelo {key}).", True
+    if status['status'] == 'queued':
+        return 'En cola...', False
+    objective = f" · Z = ${status['objective'] / 1e6:.2f}M" if status['objective'] is not None else ''
+    return f"Iteración {status['iteration']}{objective}", False
+
+# Monte Carlo en segundo plano: precios ±10%, costos ±5% y disponibilidades ±10% (desviación estándar)
+MONTE_CARLO_DRAWS = 5000
+
+
+def monte_carlo_summary(summary):
+    """Resumen JSON de ``monte_carlo`` para el estado del trabajo: utilidad por sorteo y cuantiles del mix."""
+    return {'draws': summary['draws'], 'warm_hits': summary['warm_hits'], 'profit': summary['profit'].tolist(),
+            'quantiles': summary['quantiles'], 'mix': {name: values.tolist() for name, values in summary['mix'].items()}}
+
+
+def monte_carlo_card(summary):
+    draws, profit = summary['draws'], np.asarray(summary['profit'])
+    capped = f' (limitados de {MONTE_CARLO_DRAWS} por el tamaño del catálogo)' if draws < MONTE_CARLO_DRAWS else ''
+    low, high = np.quantile(profit, [0.05, 0.95]) if draws else (0.0, 0.0)
+    return [
+        html.P(f"{draws} sorteos{capped} de precios (±10%), costos (±5%) y disponibilidades (±10%); "
+               f"{summary['warm_hits'] / max(draws, 1):.0%} se resolvieron sin pivotes desde la base óptima. "
+               f"Utilidad P5–P95: ${low:.2f}M – ${high:.2f}M.",
+               style={'fontSize': '14px', 'color': '#6b7280', 'marginBottom': '20px'}),
+        html.Div(style={'display': 'grid', 'gridTemplateColumns': 'repeat(auto-fit, minmax(450px, 1fr))', 'gap': '20px'}, children=[
+            dcc.Graph(
+                figure=cached_figure('monte-carlo-profit', lambda: go.Figure(data=[
+                    go.Histogram(x=profit, nbinsx=50, marker_color=colors['primary'])
+                ]).add_vline(
+                    x=total_profit / 1e6, line_dash='dash', line_color=colors['danger'], annotation_text='Plan actual'
+                ).update_layout(
+                    xaxis_title='Utilidad óptima (M$)',
+                    yaxis_title='Sorteos',
+                    showlegend=False,
+                    height=400
+                ))
+            ),
+            dcc.Graph(
+                # Cajas desde los cuantiles del trabajo: bigotes en P5 y P95
+                figure=cached_figure('monte-carlo-mix', lambda: go.Figure(data=[
+                    go.Box(x=[row['Producto']], lowerfence=[q[0]], q1=[q[1]], median=[q[2]], q3=[q[3]], upperfence=[q[4]],
+                           name=row['Producto'], marker_color=row['Color'])
+                    for idx, row in panel_products.iterrows()
+                    for q in [summary['mix'][row['Producto']]]
+                ]).update_layout(
+                    yaxis_title='Cantidad óptima (P5–P95)',
+                    showlegend=False,
+                    height=400
+                ))
+            )
+        ])
+    ]
+
+
+@app.callback(
+    Output('monte-carlo-body', 'children'),
+    Output('monte-carlo-poll', 'disabled'),
+    Input('monte-carlo-poll', 'n_intervals')
+)
+def poll_monte_carlo(n_intervals):
+    key = f'monte-carlo-{data_version}'
+    status = job_queue.status(key)
+    # Un trabajo fallido se reintenta solo con el primer sondeo de una pestaña recién cargada
+    if status is None or (status['status'] == 'failed' and n_intervals == 1):
+        job_queue.submit(key, monte_carlo, solution, draws=MONTE_CARLO_DRAWS, products=tuple(panel_products['Producto']),
+                         summarize=monte_carlo_summary)
+        status = job_queue.status(key)
+    if status is None:
+        return no_update, False
+    if status['status'] == 'failed':
+        return html.P(f"Error: {status['error']}", style={'color': colors['danger']}), True
+    if status['status'] == 'done':
+        if status.get('result') is None:
+            return no_update, False
+        return monte_carlo_card(status['result']), True
+    return html.P(f"Calculando sorteos... {status['iteration']} resueltos", style={'fontSize': '14px', 'color': '#6b7280'}), False
+
+# Selección de escenario: intercambio de textos precalculados en el navegador
+app.clientside_callback(
+    """
+    function(n_clicks, store) {
+        const triggered = window.dash_clientside.callback_context.triggered;
+        let selected = 0;
+        if (triggered.length && triggered[0].prop_id.endsWith('.n_clicks') && triggered[0].value) {
+            selected = JSON.parse(triggered[0].prop_id.slice(0, -'.n_clicks'.length)).index;
+        }
+        const row = store.rows[selected];
+        const styles = n_clicks.map((_, idx) => idx === selected ? store.active : store.inactive);
+        return [row.profit, row.resource, row.units, styles];
+    }
+    """,
+    Output('scenario-profit', 'children'),
+    Output('scenario-resource', 'children'),
+    Output('scenario-units', 'children'),
+    Output({'type': 'scenario-btn', 'index': ALL}, 'style'),
+    Input({'type': 'scenario-btn', 'index': ALL}, 'n_clicks'),
+    State('scenario-data', 'data')
+)
+
+mark_startup('import', time.perf_counter() - STARTED)
+
 # Ejecutar la aplicación
 if __name__ == '__main__':
     app.run(debug=False)
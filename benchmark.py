@@ -0,0 +1,186 @@
+"""Benchmarks del solver, de la construcción de pestañas y de los callbacks.
+
+    python benchmark.py                      # todo, agrega una línea a artifacts/benchmarks.jsonl
+    python benchmark.py --suites solver      # solo el simplex
+    python benchmark.py --suites startup     # import y primera respuesta de un worker nuevo
+    python benchmark.py --output otra.jsonl
+
+Cada ejecución agrega un registro JSON con la versión (commit de git y
+versión de datos) para comparar resultados entre versiones.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from lp import solve_interior, solve_lp
+from lp.sparse import CSRMatrix
+
+SIZES = (4, 100, 1000, 10_000)
+REPEAT = 5
+
+
+def _timed(fn, repeat=REPEAT):
+    """Mediana y mínimo en ms de ``repeat`` ejecuciones, más el último resultado."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': round(statistics.median(times), 3), 'min_ms': round(min(times), 3)}, value
+
+
+def synthetic_model(n, seed=0):
+    """LP de ``n`` productos con el perfil del modelo real: pocos recursos, consumo disperso."""
+    rng = np.random.default_rng(seed)
+    m = min(50, max(5, n // 200))
+    density = min(1.0, max(0.2, 5 / m))
+    mask = rng.random((m, n)) < density
+    mask[rng.integers(0, m, n), np.arange(n)] = True
+    rows, cols = np.nonzero(mask)
+    A = CSRMatrix(rows, cols, rng.uniform(0.5, 20.0, len(rows)), (m, n))
+    c = rng.uniform(100.0, 30_000.0, n)
+    b = (A @ np.full(n, 100.0)) * rng.uniform(0.05, 0.5, m)
+    return c, A, b
+
+
+def bench_solver():
+    results = []
+    for n in SIZES:
+        c, A, b = synthetic_model(n)
+        repeat = REPEAT if n <= 1000 else 2
+        timing, result = _timed(lambda: solve_lp(c, A, b, record=False), repeat)
+        results.append({'products': n, 'resources': A.shape[0], 'nnz': A.nnz, 'status': result.status,
+                        'iterations': result.iterations, **timing})
+        if n <= 1000:
+            dense = A.toarray()
+            timing, _ = _timed(lambda: solve_lp(c, dense, b, record=False), repeat)
+            results[-1]['dense_median_ms'] = timing['median_ms']
+        if n >= 1000:
+            timing, result = _timed(lambda: solve_interior(c, A, b, record=False), repeat)
+            results[-1]['interior_median_ms'] = timing['median_ms']
+            results[-1]['interior_iterations'] = result.iterations
+    return results
+
+
+def bench_tabs(app):
+    from plotly.io.json import to_json_plotly
+
+    results = []
+    for tab in app.TABS:
+        def cold():
+            app.figure_cache.invalidate()
+            return app.build_tab(tab)
+        timing, tree = _timed(cold)
+        warm, _ = _timed(lambda: app.layout_cache.get(tab, app.data_version, app.build_tab))
+        results.append({'tab': tab, 'build': timing, 'cached': warm, 'payload_bytes': len(to_json_plotly(tree))})
+    return results
+
+
+def _callback_key(app, name):
+    for key, spec in app.app.callback_map.items():
+        if getattr(spec.get('callback'), '__name__', None) == name:
+            return key
+    raise KeyError(name)
+
+
+def _post(client, payload):
+    start = time.perf_counter()
+    response = client.post('/_dash-update-component', json=payload)
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code not in (200, 204):
+        raise RuntimeError(f'{payload["output"]}: HTTP {response.status_code}')
+    return elapsed, len(response.data)
+
+
+def bench_callbacks(app):
+    client = app.server.test_client()
+    client.get('/')
+    panel = lambda tab: {'tab': tab, 'type': 'tab-panel'}
+    resource = app.bottleneck['Recurso']
+    table = {'table': 'production', 'type': 'data-table'}
+    requests = {
+        'render_content': lambda tab: {
+            'output': _callback_key(app, 'render_content'),
+            'outputs': [{'id': panel(name), 'property': 'children'} for name in app.TABS],
+            'inputs': [{'id': 'pending-tab', 'property': 'data', 'value': tab}],
+            'changedPropIds': ['pending-tab.data'],
+            'state': [],
+        },
+        'update_parametric': lambda tab: {
+            'output': _callback_key(app, 'update_parametric'),
+            'outputs': [{'id': 'parametric-graph', 'property': 'figure'},
+                        {'id': 'parametric-note', 'property': 'children'}],
+            'inputs': [{'id': 'parametric-resource', 'property': 'value', 'value': resource}],
+            'changedPropIds': ['parametric-resource.value'],
+            'state': [],
+        },
+        'update_table': lambda tab: {
+            'output': _callback_key(app, 'update_table'),
+            'outputs': {'id': table, 'property': 'data'},
+            'inputs': [{'id': table, 'property': 'page_current', 'value': 0},
+                       {'id': table, 'property': 'page_size', 'value': 10},
+                       {'id': table, 'property': 'sort_by', 'value': [{'column_id': 'Utilidad', 'direction': 'desc'}]}],
+            'changedPropIds': [json.dumps(table, separators=(',', ':'), sort_keys=True) + '.sort_by'],
+            'state': [{'id': table, 'property': 'id', 'value': table}],
+        },
+    }
+    results = []
+    for name, build in requests.items():
+        tabs = app.TABS if name == 'render_content' else (None,)
+        for tab in tabs:
+            samples = [_post(client, build(tab)) for _ in range(REPEAT)]
+            times = [ms for ms, size in samples]
+            results.append({'callback': name, 'tab': tab, 'median_ms': round(statistics.median(times), 3),
+                            'min_ms': round(min(times), 3), 'response_bytes': samples[-1][1]})
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suites', nargs='+', choices=('solver', 'tabs', 'callbacks', 'startup'),
+                        default=['solver', 'tabs', 'callbacks'])
+    parser.add_argument('--output', default=Path('artifacts') / 'benchmarks.jsonl', type=Path)
+    args = parser.parse_args()
+
+    record = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+    }
+    if 'solver' in args.suites:
+        record['solver'] = bench_solver()
+    if 'startup' in args.suites:
+        # Antes de importar app en este proceso: cada medición es un intérprete nuevo
+        import startup
+        record['startup'] = {'cold': startup.measure(artifacts=False), 'artifacts': startup.measure(artifacts=True)}
+    if {'tabs', 'callbacks'} & set(args.suites):
+        import app
+        record['data_version'] = app.data_version
+        if 'tabs' in args.suites:
+            record['tabs'] = bench_tabs(app)
+        if 'callbacks' in args.suites:
+            record['callbacks'] = bench_callbacks(app)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'a', encoding='utf-8') as handle:
+        handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+    print(json.dumps(record, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
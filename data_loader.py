@@ -0,0 +1,118 @@
+"""Carga del modelo de producción desde archivos.
+
+Productos, recursos y coeficientes de consumo se leen de ``DATA_DIR`` en CSV
+o en formatos columnares (Parquet, Feather/Arrow; estos con lectura por
+mapeo de memoria vía pyarrow). Cada tabla se lee y valida una sola vez, en el
+primer acceso, y queda en caché para el resto del proceso.
+"""
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(os.environ.get('NVIDIA_DATA_DIR', Path(__file__).resolve().parent / 'data'))
+
+FORMATS = ('.parquet', '.feather', '.arrow', '.csv')
+
+# Columnas obligatorias de cada tabla: nombre -> tipo esperado
+SCHEMAS = {
+    'products': {'Producto': 'text', 'Precio': 'number', 'Costo': 'number', 'Color': 'text'},
+    'resources': {'Recurso': 'text', 'Disponible': 'number', 'Unidad': 'text'},
+    'consumption': {'Recurso': 'text'},
+    # Formato largo para catálogos grandes: una fila por coeficiente no nulo
+    'consumption_long': {'Recurso': 'text', 'Producto': 'text', 'Consumo': 'number'},
+}
+
+
+def _read(path):
+    if path.suffix == '.csv':
+        return pd.read_csv(path)
+    try:
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError(f'Se requiere pyarrow para leer {path.name}') from exc
+    if path.suffix == '.parquet':
+        table = pq.read_table(path, memory_map=True)
+    else:
+        table = feather.read_table(path, memory_map=True)
+    return table.to_pandas()
+
+
+def _validate(name, frame, extra_numeric=(), unique=True):
+    schema = dict(SCHEMAS[name], **{column: 'number' for column in extra_numeric})
+    missing = [column for column in schema if column not in frame.columns]
+    if missing:
+        raise ValueError(f"{name}: faltan columnas {', '.join(missing)}")
+    frame = frame.copy()
+    for column, kind in schema.items():
+        if kind == 'number':
+            values = pd.to_numeric(frame[column], errors='coerce')
+            if values.isna().any():
+                raise ValueError(f'{name}: la columna {column} debe ser numérica')
+            frame[column] = values.astype(float)
+        else:
+            frame[column] = frame[column].astype(str)
+    key = next(iter(schema))
+    if unique and frame[key].duplicated().any():
+        raise ValueError(f'{name}: valores repetidos en {key}')
+    return frame
+
+
+class ModelData:
+    """Acceso perezoso y en caché a las tablas del modelo."""
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = Path(data_dir)
+        self._frames = {}
+        self._lock = threading.RLock()
+
+    def path(self, name):
+        for suffix in FORMATS:
+            candidate = self.data_dir / f'{name}{suffix}'
+            if candidate.exists():
+                return candidate
+        raise FileNotFoundError(f'No se encontró {name} en {self.data_dir}')
+
+    def _load(self, name, build):
+        frame = self._frames.get(name)
+        if frame is None:
+            with self._lock:
+                frame = self._frames.get(name)
+                if frame is None:
+                    frame = self._frames[name] = build()
+        return frame
+
+    @property
+    def products(self):
+        return self._load('products', lambda: _validate('products', _read(self.path('products'))))
+
+    @property
+    def resources(self):
+        return self._load('resources', lambda: _validate('resources', _read(self.path('resources'))))
+
+    @property
+    def consumption(self):
+        return self._load('consumption', self._load_consumption)
+
+    def _load_consumption(self):
+        products = self.products['Producto']
+        raw = _read(self.path('consumption'))
+        if {'Producto', 'Consumo'} <= set(raw.columns):
+            frame = _validate('consumption_long', raw, unique=False)
+            unknown = set(frame['Producto']) - set(products)
+            if unknown:
+                raise ValueError(f"consumption: productos desconocidos: {', '.join(sorted(unknown))}")
+            unknown = set(frame['Recurso']) - set(self.resources['Recurso'])
+        else:
+            frame = _validate('consumption', raw, extra_numeric=products)
+            frame = frame[['Recurso', *products]]
+            unknown = set(frame['Recurso']) ^ set(self.resources['Recurso'])
+        if unknown:
+            raise ValueError(f"consumption: recursos que no coinciden con resources: {', '.join(sorted(unknown))}")
+        return frame
+
+    def invalidate(self):
+        with self._lock:
+            self._frames.clear()
@@ -0,0 +1,32 @@
+"""Configuración de gunicorn (se lee sola desde el directorio de trabajo).
+
+La app se importa una vez en el master (``preload_app``): ahí se resuelve el
+modelo y sus coeficientes y resultados se publican en ``NVIDIA_SHARED_DIR``.
+Los workers se crean después con fork y leen esos arreglos mapeados desde la
+misma memoria; lo que resuelva cualquier worker queda visible para el resto.
+El estado de los trabajos en segundo plano va a ``NVIDIA_JOB_DIR`` para que el
+sondeo funcione sin importar qué worker lo atiende.
+
+Si no se indican, ambos van dentro de un directorio nuevo de ``mkdtemp``
+(modo 0o700, nombre impredecible). Se crea al leer esta configuración y no en
+``on_starting`` porque con ``preload_app`` la app se importa antes de ese
+hook. Al salir se borra solo ese directorio, nunca una ruta configurada.
+"""
+import os
+import shutil
+import tempfile
+
+preload_app = True
+
+_created = None
+if not (os.environ.get('NVIDIA_SHARED_DIR') and os.environ.get('NVIDIA_JOB_DIR')):
+    # /dev/shm es memoria compartida; sin él, el directorio temporal con la caché de páginas del sistema
+    _created = tempfile.mkdtemp(prefix='nvidia-lp-', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    for _variable, _name in (('NVIDIA_SHARED_DIR', 'shared'), ('NVIDIA_JOB_DIR', 'jobs')):
+        if not os.environ.get(_variable):
+            os.environ[_variable] = os.path.join(_created, _name)
+
+
+def on_exit(server):
+    if _created is not None:
+        shutil.rmtree(_created, ignore_errors=True)
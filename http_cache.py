@@ -0,0 +1,120 @@
+"""Compresión, cabeceras de caché y ETag para el ``server`` de Flask.
+
+- Las respuestas de texto/JSON por encima de ``min_size`` bytes se comprimen
+  con brotli (si el paquete está instalado y el cliente lo acepta) o gzip.
+- Los recursos de componentes que Dash sirve con huella en la URL se marcan
+  como inmutables por un año; como su contenido no cambia, el cuerpo
+  comprimido se guarda por (ruta, codificación) y se comprime una sola vez.
+- Layout, dependencias y callbacks llevan un ETag débil derivado de la
+  versión de datos y de la petición (débil porque el mismo ETag cubre el
+  cuerpo sin comprimir, gzip y brotli). Layout y dependencias responden 304
+  al navegador. En callbacks el 304 solo lo aprovechan clientes que envían
+  ``If-None-Match`` por su cuenta (scripts, pruebas de carga): el renderer
+  de Dash hace ``fetch`` POST y el navegador no reenvía el ETag.
+"""
+import gzip
+import hashlib
+import json
+
+import flask
+from dash.fingerprint import check_fingerprint
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('text/', 'application/json', 'application/javascript')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Callbacks que dependen de algo más que los datos (trabajos en curso): sin ETag
+UNCACHED_OUTPUTS = ('solve-',)
+
+
+def _etag(version, payload):
+    return hashlib.sha1(version.encode() + b'\0' + payload).hexdigest()[:20]
+
+
+def _callback_etag(version):
+    body = flask.request.get_data(cache=True)
+    try:
+        output = json.loads(body).get('output', '')
+    except (ValueError, AttributeError):
+        return None
+    if any(prefix in output for prefix in UNCACHED_OUTPUTS):
+        return None
+    return _etag(version, body)
+
+
+def _immutable(path):
+    return '/_dash-component-suites/' in path and check_fingerprint(path)[1]
+
+
+def optimize(server, version, min_size=1024, level=6):
+    """``version()`` devuelve la versión de datos vigente (invalida los ETag al cambiar)."""
+    # Cuerpos comprimidos de los recursos con huella, por (ruta, codificación)
+    compressed = {}
+
+    def encode(data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=min(level, 11))
+        return gzip.compress(data, compresslevel=level)
+
+    @server.before_request
+    def _not_modified():
+        if flask.request.method != 'POST' or not flask.request.path.endswith('/_dash-update-component'):
+            return None
+        etag = _callback_etag(version())
+        if etag is not None and flask.request.if_none_match.contains_weak(etag):
+            response = flask.Response(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+        return None
+
+    @server.after_request
+    def _compress(response):
+        accepted = flask.request.accept_encodings
+        if (response.status_code != 200 or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or not (response.mimetype or '').startswith(COMPRESSIBLE)):
+            return response
+        data = response.get_data()
+        response.vary.add('Accept-Encoding')
+        if len(data) < min_size:
+            return response
+        if brotli is not None and accepted['br']:
+            encoding = 'br'
+        elif accepted['gzip']:
+            encoding = 'gzip'
+        else:
+            return response
+        path = flask.request.path
+        if _immutable(path):
+            key = (path, encoding)
+            if key not in compressed:
+                compressed[key] = encode(data, encoding)
+            response.set_data(compressed[key])
+        else:
+            response.set_data(encode(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    # Registrada después, se ejecuta antes que la compresión: el ETag es del cuerpo sin comprimir
+    @server.after_request
+    def _cache_headers(response):
+        path = flask.request.path
+        if response.status_code != 200:
+            return response
+        if _immutable(path):
+            response.headers['Cache-Control'] = IMMUTABLE
+        elif path.endswith(('/_dash-layout', '/_dash-dependencies')):
+            response.set_etag(_etag(version(), response.get_data()), weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            response.make_conditional(flask.request)
+        elif path.endswith('/_dash-update-component'):
+            etag = _callback_etag(version())
+            if etag is not None:
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    return server
@@ -0,0 +1,212 @@
+"""Cola de trabajos en segundo plano para resoluciones largas.
+
+Los trabajos se ejecutan en un pool de procesos local para no bloquear a los
+workers de gunicorn. Cada trabajo se identifica con la huella del modelo que
+resuelve: si ya existe (en curso o terminado) se reutiliza en lugar de volver
+a resolver. El avance por iteración se publica en un diccionario compartido
+que el dashboard consulta por sondeo.
+
+Con ``directory`` el estado de cada trabajo vive en un archivo JSON de ese
+directorio en lugar de la memoria del proceso: con varios workers de gunicorn
+el sondeo puede llegar a cualquiera de ellos y todos ven el mismo estado. El
+estado guarda el pid del worker dueño y este renueva la fecha del archivo
+cada HEARTBEAT_INTERVAL s; un trabajo en cola o en curso cuyo dueño murió (p.
+ej. por el timeout de gunicorn) o sin latido en STALE_AFTER s cuenta como
+fallido y se puede volver a lanzar. ``summarize`` convierte el resultado en un
+resumen JSON que se guarda en el estado, para que cualquier worker lo muestre
+sin tener el resultado completo.
+"""
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from lp._io import atomic_write, private_directory
+
+PROGRESS_INTERVAL = 0.2
+MAX_RESULTS = 32
+HEARTBEAT_INTERVAL = 5.0
+STALE_AFTER = 30.0
+
+
+class _Reporter:
+    """Publica ``(iteración, objetivo)`` en el diccionario compartido, como máximo cada PROGRESS_INTERVAL s."""
+
+    def __init__(self, progress):
+        self.progress = progress
+        self._last = 0.0
+
+    def __call__(self, iteration, objective):
+        now = time.monotonic()
+        if now - self._last >= PROGRESS_INTERVAL:
+            self._last = now
+            self.progress.update(status='running', iteration=iteration, objective=objective)
+
+
+class _JobState:
+    """Estado de un trabajo en ``<directorio>/<clave>.json``, con la interfaz de diccionario que usa la cola."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def read(self):
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def update(self, **fields):
+        state = {**(self.read() or {}), **fields}
+        with atomic_write(self.path, 'w', encoding='utf-8') as handle:
+            json.dump(state, handle)
+
+    def __setitem__(self, name, value):
+        self.update(**{name: value})
+
+    def touch(self):
+        try:
+            os.utime(self.path)
+        except FileNotFoundError:
+            pass
+
+    def age(self):
+        try:
+            return time.time() - os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def remove(self):
+        self.path.unlink(missing_ok=True)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _run(fn, progress, args, kwargs):
+    progress['status'] = 'running'
+    return fn(*args, progress=_Reporter(progress), **kwargs)
+
+
+class JobQueue:
+    def __init__(self, processes=None, directory=None):
+        self.processes = processes
+        self.directory = Path(directory) if directory else None
+        self._pool = None
+        self._manager = None
+        self._jobs = {}
+        self._order = []
+        self._lock = threading.Lock()
+        self._heartbeat = None
+
+    def _start(self):
+        if self._pool is None:
+            if self.directory is None:
+                self._manager = multiprocessing.Manager()
+            else:
+                private_directory(self.directory)
+                self._heartbeat = threading.Thread(target=self._beat, daemon=True)
+                self._heartbeat.start()
+            self._pool = ProcessPoolExecutor(self.processes)
+
+    def _beat(self):
+        # Solo cambia la fecha del archivo: no reescribe el estado que publica el proceso del trabajo
+        while self._pool is not None:
+            with self._lock:
+                running = [job['progress'] for job in self._jobs.values() if not job['future'].done()]
+            for progress in running:
+                progress.touch()
+            time.sleep(HEARTBEAT_INTERVAL)
+
+    def _state(self, key):
+        return _JobState(self.directory / f'{key}.json')
+
+    def submit(self, key, fn, *args, summarize=None, **kwargs):
+        """Encola ``fn(*args, progress=..., **kwargs)`` con id ``key`` salvo que ya exista.
+
+        ``summarize(resultado)`` da el resumen JSON que ``status`` devuelve como ``result`` al terminar.
+        """
+        with self._lock:
+            # Con directorio compartido el trabajo puede haberlo lanzado otro worker
+            current = self.status(key)
+            if current is not None and current.get('status') != 'failed':
+                return key
+            self._start()
+            initial = dict(status='queued', iteration=0, objective=None, error=None, result=None, owner=os.getpid())
+            if self.directory is None:
+                progress = self._manager.dict(**initial)
+            else:
+                progress = self._state(key)
+                progress.update(**initial)
+            future = self._pool.submit(_run, fn, progress, args, kwargs)
+            self._jobs[key] = {'future': future, 'progress': progress, 'summarize': summarize}
+            self._order.append(key)
+            self._evict()
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return key
+
+    def _finish(self, key, future):
+        job = self._jobs.get(key)
+        if job is None:
+            return
+        progress = job['progress']
+        error = future.exception()
+        if error is None and job['summarize'] is not None:
+            try:
+                progress.update(status='done', result=job['summarize'](future.result()))
+                return
+            except Exception as exc:
+                error = exc
+        if error is not None:
+            progress.update(status='failed', error=str(error))
+        else:
+            progress['status'] = 'done'
+
+    def _evict(self):
+        # Solo se descartan trabajos terminados, del más antiguo al más reciente
+        finished = [key for key in self._order if self._jobs[key]['future'].done()]
+        for key in finished[:max(0, len(self._order) - MAX_RESULTS)]:
+            self._order.remove(key)
+            job = self._jobs.pop(key)
+            if self.directory is not None:
+                job['progress'].remove()
+
+    def status(self, key):
+        if self.directory is not None:
+            state = self._state(key)
+            current = state.read()
+            if current is not None and current.get('status') in ('queued', 'running'):
+                age = state.age()
+                owner = current.get('owner')
+                if (owner is not None and not _alive(owner)) or age is None or age > STALE_AFTER:
+                    current.update(status='failed', error='el worker que lo resolvía dejó de responder')
+            return current
+        job = self._jobs.get(key)
+        if job is None:
+            return None
+        return dict(job['progress'])
+
+    def result(self, key):
+        """Resultado del trabajo si terminó bien en este proceso; None en otro caso (incluso si lo resolvió otro worker)."""
+        job = self._jobs.get(key)
+        if job is None or not job['future'].done() or job['future'].exception() is not None:
+            return None
+        return job['future'].result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                if self._manager is not None:
+                    self._manager.shutdown()
+                self._pool = self._manager = None
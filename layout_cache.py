@@ -0,0 +1,180 @@
+"""Caché de layouts por pestaña y de figuras por gráfico.
+
+Cada pestaña (o figura) se construye una sola vez por versión de datos y se
+guarda ya serializada. Las peticiones siguientes reciben el payload
+precomputado sin reconstruir componentes ni validar figuras de plotly; un
+cambio de versión descarta todo.
+
+Dash vuelve a serializar lo que devuelve un callback en cada respuesta, así
+que ``ResponseCache`` guarda además el cuerpo JSON completo de la respuesta
+del callback que entrega las pestañas y lo responde tal cual, sin pasar por
+el callback ni por el serializador.
+"""
+import base64
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import flask
+import numpy as np
+from plotly.io.json import to_json_plotly
+
+# Arreglos numéricos como {dtype, bdata} en base64: requiere plotly.js >= 2.28,
+# posterior al que trae dash 2.14, por eso queda desactivado por defecto
+TYPED_ARRAYS = False
+TYPED_ARRAY_MIN = 8
+
+
+@dataclass(frozen=True)
+class CachedLayout:
+    payload: str
+    tree: dict
+
+
+def _typed_arrays(value):
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'fiu' and value.size >= TYPED_ARRAY_MIN:
+        small = value.dtype.kind != 'f' and np.abs(value).max() < 2 ** 31
+        encoded = {'dtype': 'i4' if small else 'f8',
+                   'bdata': base64.b64encode(value.astype('<i4' if small else '<f8').tobytes()).decode('ascii')}
+        if value.ndim > 1:
+            encoded['shape'] = ', '.join(map(str, value.shape))
+        return encoded
+    if isinstance(value, dict):
+        return {key: _typed_arrays(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_typed_arrays(item) for item in value]
+    return value
+
+
+def figure_json(figure):
+    """Serializa una figura sin espacios y, si se habilita, con arreglos tipados."""
+    spec = figure.to_plotly_json() if hasattr(figure, 'to_plotly_json') else figure
+    if TYPED_ARRAYS:
+        spec = _typed_arrays(spec)
+    return to_json_plotly(spec)
+
+
+class LayoutCache:
+    """``encode`` convierte lo que devuelve el builder en el JSON que se guarda."""
+
+    def __init__(self, encode=to_json_plotly):
+        self._encode = encode
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, version, builder):
+        entry = self.entry(key, version, builder)
+        return entry.tree
+
+    def entry(self, key, version, builder):
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            self.misses += 1
+        payload = self._encode(builder(key))
+        entry = CachedLayout(payload, json.loads(payload))
+        with self._lock:
+            if version == self._version:
+                self._entries.setdefault(key, entry)
+                entry = self._entries[key]
+        return entry
+
+    def warm(self, keys, version, builder):
+        for key in keys:
+            self.entry(key, version, builder)
+
+    def export(self, version):
+        """``{clave: payload}`` de la versión ``version`` (vacío si la caché tiene otra)."""
+        with self._lock:
+            if version != self._version:
+                return {}
+            return {key: entry.payload for key, entry in self._entries.items()}
+
+    def load(self, version, payloads):
+        """Agrega payloads ya serializados (p. ej. leídos de disco); devuelve cuántos cargó."""
+        entries = {key: CachedLayout(payload, json.loads(payload)) for key, payload in payloads.items()}
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            for key, entry in entries.items():
+                self._entries.setdefault(key, entry)
+        return len(entries)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+
+class ResponseCache:
+    """Respuestas ya serializadas del callback con salida ``output``, por versión y cuerpo de la petición."""
+
+    def __init__(self, output, maxsize=256):
+        self.output = output
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, version):
+        request = flask.request
+        if request.method != 'POST' or not request.path.endswith('/_dash-update-component'):
+            return None
+        body = request.get_data(cache=True)
+        try:
+            if json.loads(body).get('output') != self.output:
+                return None
+        except (ValueError, AttributeError):
+            return None
+        return version + ':' + hashlib.sha1(body).hexdigest()
+
+    def install(self, server, version):
+        """Registra los hooks en ``server``; ``version()`` es la versión de datos vigente.
+
+        Se instala después de ``http_cache.optimize`` para guardar el cuerpo antes de comprimirlo.
+        """
+
+        @server.before_request
+        def _cached_response():
+            key = self._key(version())
+            if key is None:
+                return None
+            with self._lock:
+                payload = self._entries.get(key)
+                if payload is None:
+                    self.misses += 1
+                    return None
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return flask.Response(payload, mimetype='application/json')
+
+        @server.after_request
+        def _store_response(response):
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            key = self._key(version())
+            if key is not None:
+                with self._lock:
+                    if key not in self._entries:
+                        self._entries[key] = response.get_data()
+                        while len(self._entries) > self.maxsize:
+                            self._entries.popitem(last=False)
+            return response
+
+        return server
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
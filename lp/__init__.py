@@ -0,0 +1,19 @@
+from .branch_bound import IntegerResult, branch_and_bound
+from .cache import SolutionCache, lp_hash
+from .decomposition import BlockStructure, find_blocks, solve_decomposed
+from .engines import choose_engine, solve
+from .interior import solve_interior
+from .parametric import ParametricResult, rhs_parametric
+from .presolve import Presolved, presolve, solve_presolved
+from .ranging import Ranging, compute_ranging
+from .scenarios import BatchResult, solve_batch
+from .shared import SharedStore
+from .simplex import LPResult, RevisedSimplex, solve_lp
+from .sparse import CSRMatrix
+
+__all__ = [
+    'BatchResult', 'BlockStructure', 'CSRMatrix', 'IntegerResult', 'LPResult', 'ParametricResult',
+    'Presolved', 'Ranging', 'RevisedSimplex', 'SharedStore', 'SolutionCache', 'branch_and_bound',
+    'choose_engine', 'compute_ranging', 'find_blocks', 'lp_hash', 'presolve', 'rhs_parametric', 'solve',
+    'solve_batch', 'solve_decomposed', 'solve_interior', 'solve_lp', 'solve_presolved',
+]
@@ -0,0 +1,51 @@
+"""Archivos compartidos entre procesos: escritura atómica y directorios privados.
+
+Las cachés en disco, la memoria compartida, el estado de los trabajos y los
+artefactos de arranque escriben con ``atomic_write`` (otro proceso nunca lee
+un archivo a medias). Los directorios cuyo contenido se vuelve a cargar como
+objetos pasan por ``private_directory``: si otro usuario pudiera escribir ahí,
+podría plantar entradas.
+"""
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def atomic_write(path, mode='wb', encoding=None, permissions=None):
+    """Escribe en un temporal junto a ``path`` y lo renombra al cerrar; si algo falla, lo borra."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as handle:
+            yield handle
+        if permissions is not None:
+            os.chmod(tmp, permissions)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def private_directory(directory):
+    """Crea ``directory`` con modo 0o700 si falta; ``PermissionError`` si otro usuario pudo plantar entradas."""
+    directory = Path(directory)
+    try:
+        directory.mkdir(mode=0o700, parents=True)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if stat.S_ISLNK(info.st_mode) or not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f'{directory}: no es un directorio (¿enlace simbólico?)')
+    if info.st_uid != os.getuid():
+        raise PermissionError(f'{directory}: pertenece a otro usuario')
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f'{directory}: con permiso de escritura para grupo u otros')
+    return directory
+
+
+def owned(handle):
+    """True si el archivo abierto es del usuario actual."""
+    return os.fstat(handle.fileno()).st_uid == os.getuid()
@@ -0,0 +1,173 @@
+"""Ramificación y acotamiento para soluciones enteras.
+
+Cada nodo es el LP relajado más una lista de cotas ``x_j <= v`` / ``x_j >= v``
+agregadas como filas. El nodo hijo hereda la base óptima del padre extendida
+con la holgura de la nueva fila (y su inversa por bloques, sin refactorizar):
+esa base sigue siendo dual factible, así que el simplex dual la repara en
+pocos pivotes. Los nodos se exploran por mejor cota y se evalúan por tandas,
+en un pool de procesos cuando la tanda es grande.
+"""
+import heapq
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .simplex import solve_lp
+from .sparse import CSRMatrix, as_matrix
+
+INTEGER_TOL = 1e-6
+POOL_THRESHOLD = 4
+
+_worker_problem = None
+
+
+@dataclass
+class IntegerResult:
+    status: str
+    x: np.ndarray
+    objective: float
+    bound: float
+    nodes: int
+    elapsed: float
+
+    @property
+    def gap(self):
+        if not np.isfinite(self.objective):
+            return np.inf
+        return max(0.0, self.bound - self.objective) / max(1.0, abs(self.objective))
+
+
+def _augment(A, bounds):
+    """Agrega a ``A`` una fila ``±e_j`` por cada cota ``(j, signo, valor)``."""
+    m, n = A.shape
+    rows = np.arange(m, m + len(bounds))
+    cols = np.array([j for j, sign, value in bounds], dtype=np.int64)
+    signs = np.array([sign for j, sign, value in bounds], dtype=float)
+    if isinstance(A, CSRMatrix):
+        return CSRMatrix(np.concatenate([A.row_ids, rows]), np.concatenate([A.indices, cols]),
+                         np.concatenate([A.data, signs]), (m + len(bounds), n))
+    extra = np.zeros((len(bounds), n))
+    extra[np.arange(len(bounds)), cols] = signs
+    return np.vstack([A, extra])
+
+
+def _extend_basis(basis, binv, n, bounds):
+    """Base e inversa del hijo: la holgura de cada fila nueva entra básica."""
+    for j, sign, value in bounds:
+        k = len(basis)
+        a_basic = np.where(basis == j, sign, 0.0)
+        last = np.append(-a_basic @ binv, 1.0)
+        binv = np.block([[binv, np.zeros((k, 1))], [last]])
+        basis = np.append(basis, n + k)
+    return basis, binv
+
+
+def _init_worker(c, A, b):
+    global _worker_problem
+    _worker_problem = (c, A, b)
+
+
+def _solve_node(task):
+    c, A, b = _worker_problem
+    bounds, parent_bounds, basis, binv = task
+    rows = parent_bounds + bounds
+    A_node = _augment(A, rows)
+    b_node = np.concatenate([b, [sign * value for j, sign, value in rows]])
+    if basis is not None:
+        basis, binv = _extend_basis(basis, binv, A.shape[1], bounds)
+    result = solve_lp(c, A_node, b_node, basis=basis, basis_inverse=binv, record=False)
+    return result.status, result.x, result.objective, result.basis, result.basis_inverse
+
+
+def _fractional(x, integer):
+    frac = np.abs(x - np.round(x))
+    frac[~integer] = 0.0
+    j = int(np.argmax(frac))
+    return j if frac[j] > INTEGER_TOL else None
+
+
+def _rounded(c, A, b, x, integer):
+    """Heurística de redondeo hacia abajo: devuelve ``(x, objetivo)`` si es factible."""
+    candidate = np.where(integer, np.floor(x + INTEGER_TOL), x)
+    if (A @ candidate <= b + 1e-7).all():
+        return candidate, float(c @ candidate)
+    return None, -np.inf
+
+
+def branch_and_bound(c, A, b, integer=None, root=None, node_limit=10_000, time_limit=30.0, processes=None):
+    """Maximiza ``c·x`` con ``A x <= b``, ``x >= 0`` y ``x_j`` enteras donde ``integer`` es True.
+
+    ``root`` es el resultado ya resuelto de la relajación (si se tiene) y sirve
+    de arranque en caliente para todo el árbol.
+    """
+    c = np.asarray(c, dtype=float)
+    A = as_matrix(A)
+    b = np.asarray(b, dtype=float)
+    n = A.shape[1]
+    integer = np.ones(n, dtype=bool) if integer is None else np.asarray(integer, dtype=bool)
+    processes = processes or os.cpu_count() or 1
+    start = time.monotonic()
+    _init_worker(c, A, b)
+
+    if root is None:
+        root = solve_lp(c, A, b, record=False)
+    if not root.optimal:
+        return IntegerResult(root.status, root.x, -np.inf, np.inf if root.status == 'unbounded' else -np.inf, 1, 0.0)
+
+    best_x, best = _rounded(c, A, b, root.x, integer)
+    counter = itertools.count()
+    # Montículo de máximos por cota: (-cota, desempate, cotas acumuladas, x, base, inversa)
+    heap = [(-root.objective, next(counter), [], root.x, root.basis, root.basis_inverse)]
+    nodes = 1
+    pool = None
+    status = 'optimal'
+    try:
+        while heap:
+            if nodes >= node_limit:
+                status = 'node_limit'
+                break
+            if time.monotonic() - start >= time_limit:
+                status = 'time_limit'
+                break
+            batch = []
+            while heap and len(batch) < processes:
+                neg_bound, _, bounds, x, basis, binv = heapq.heappop(heap)
+                if -neg_bound <= best + INTEGER_TOL:
+                    continue
+                j = _fractional(x, integer)
+                if j is None:
+                    best, best_x = -neg_bound, x
+                    continue
+                value = x[j]
+                # Hijos: x_j <= piso(v)  y  x_j >= techo(v)  (como -x_j <= -techo(v))
+                batch.append(([(j, 1.0, np.floor(value))], bounds, basis, binv))
+                batch.append(([(j, -1.0, np.ceil(value))], bounds, basis, binv))
+            if not batch:
+                continue
+            if len(batch) >= POOL_THRESHOLD and processes > 1:
+                if pool is None:
+                    pool = ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(c, A, b))
+                solved = list(pool.map(_solve_node, batch))
+            else:
+                solved = [_solve_node(task) for task in batch]
+            nodes += len(batch)
+            for (bounds, parent_bounds, *_), (st, x, objective, basis, binv) in zip(batch, solved):
+                if st != 'optimal' or objective <= best + INTEGER_TOL:
+                    continue
+                candidate, value = _rounded(c, A, b, x, integer)
+                if value > best:
+                    best, best_x = value, candidate
+                heapq.heappush(heap, (-objective, next(counter), parent_bounds + bounds, x[:n], basis, binv))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    bound = max([best] + [-item[0] for item in heap]) if status != 'optimal' else best
+    if best_x is None:
+        status = 'infeasible' if status == 'optimal' else status
+        return IntegerResult(status, np.zeros(n), -np.inf, bound, nodes, time.monotonic() - start)
+    return IntegerResult(status, np.round(best_x, 6), float(c @ best_x), bound, nodes, time.monotonic() - start)
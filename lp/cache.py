@@ -0,0 +1,116 @@
+"""Caché de soluciones direccionada por contenido.
+
+La clave es un hash de la forma canónica del problema (``c`` y ``b`` como
+bytes float64; ``A`` como su forma y sus no ceros ``(fila, columna, valor)``
+ordenados por fila y columna), así que dos modelos iguales comparten entrada
+aunque vengan de DataFrames distintos o uno esté denso y el otro en CSR.
+Quien guarda soluciones de distintos motores o arranques agrega eso a la
+clave. Las entradas viven en un LRU en memoria y, si se indica un directorio,
+también en disco para compartirlas entre procesos (p. ej. workers de
+gunicorn). Con un ``SharedStore`` los arreglos del resultado se publican en
+memoria compartida y cada proceso los lee sin copiarlos. El nivel en disco
+usa el mismo formato de ``SharedStore`` (solo tipos permitidos, directorio
+privado) y no ``pickle``: un archivo plantado no puede ejecutar código.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from .shared import SharedStore
+from .sparse import as_matrix, triplets
+
+
+def _canonical_triplets(A):
+    """No ceros de ``A`` ordenados por (fila, columna), con las entradas repetidas sumadas."""
+    rows, cols, values = triplets(A)
+    n = max(A.shape[1], 1)
+    position, inverse = np.unique(np.asarray(rows, dtype=np.int64) * n + np.asarray(cols, dtype=np.int64),
+                                  return_inverse=True)
+    summed = np.zeros(len(position))
+    np.add.at(summed, inverse, np.asarray(values, dtype=float))
+    keep = summed != 0
+    return position[keep] // n, position[keep] % n, summed[keep]
+
+
+def lp_hash(c, A, b):
+    A = as_matrix(A)
+    digest = hashlib.sha256()
+    digest.update(np.asarray(A.shape, dtype=np.int64).tobytes())
+    for part in (np.asarray(c, dtype=float), np.asarray(b, dtype=float), *_canonical_triplets(A)):
+        digest.update(np.ascontiguousarray(part).tobytes())
+    return digest.hexdigest()
+
+
+class SolutionCache:
+    def __init__(self, maxsize=128, directory=None, shared=None):
+        self.maxsize = maxsize
+        self.disk = SharedStore(directory) if directory else None
+        self.shared = SharedStore(shared) if isinstance(shared, (str, Path)) else shared
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        value = self._read(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key, value):
+        # Con memoria compartida el LRU guarda la vista mapeada y no una copia propia
+        value = self._write(key, value)
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _read(self, key):
+        for store in (self.shared, self.disk):
+            if store is not None:
+                value = store.get(key)
+                if value is not None:
+                    return value
+        return None
+
+    def _write(self, key, value):
+        # Valores con tipos que no se pueden guardar se quedan solo en el LRU
+        for store in (self.disk, self.shared):
+            if store is None:
+                continue
+            try:
+                store.put(key, value)
+            except TypeError:
+                continue
+            if store is self.shared:
+                mapped = store.get(key)
+                value = mapped if mapped is not None else value
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,289 @@
+"""Descomposición de Dantzig-Wolfe para modelos con familias de productos separables.
+
+Las filas acoplantes (horas, empaque, presupuesto) salen de la estructura
+del grafo filas-columnas y no de su densidad: son las filas cuyo retiro lo
+parte en componentes, y esas componentes son los bloques (p. ej. GDDR6X con
+RTX 4090/4070 y HBM3 con A100/H100). Una fila densa que solo toca columnas de
+un bloque (la de una familia dominante) queda en su bloque. El maestro elige combinaciones convexas de soluciones
+propuestas por cada bloque sujetas a las filas acoplantes; los subproblemas
+de los bloques son independientes y se resuelven en un pool de procesos.
+
+Cuando no hay bloques separables o algún paso falla se resuelve el modelo
+completo con el simplex y se registra el motivo en el log de ``lp``.
+
+Como ``x = 0`` es factible en cada bloque (``b >= 0``), la convexidad se
+escribe ``Σ λ <= 1`` y el maestro es otro ``max c·x, A x <= b`` con base de
+holguras factible. Al converger, la solución combinada se lleva a un vértice
+con el mismo crossover del punto interior, así que el resultado trae base e
+inversa como cualquier otro ``LPResult``.
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .interior import crossover_basis
+from .simplex import TOL, solve_lp
+from .sparse import CSRMatrix, as_matrix, triplets
+
+# Por debajo de estas columnas los subproblemas se resuelven en el proceso actual
+POOL_MIN_COLUMNS = 2000
+MAX_ROUNDS = 500
+
+_worker_blocks = None
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BlockStructure:
+    coupling: np.ndarray
+    blocks: list
+    free: np.ndarray
+
+    @property
+    def separable(self):
+        return len(self.blocks) >= 2
+
+
+def _components(m, n, rows, cols, coupling):
+    """Etiqueta de componente de cada columna sin las filas ``coupling``, y qué columnas tocan alguna otra fila."""
+    live = ~coupling[rows]
+    r, j = rows[live], cols[live]
+    # Propagación de etiquetas: cada columna toma la menor etiqueta alcanzable por filas compartidas
+    labels = np.arange(n)
+    while True:
+        row_label = np.full(m, n)
+        np.minimum.at(row_label, r, labels[j])
+        updated = labels.copy()
+        np.minimum.at(updated, j, row_label[r])
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    linked = np.zeros(n, dtype=bool)
+    linked[j] = True
+    return labels, linked
+
+
+class _UnionFind:
+    """Componentes de las columnas tocadas por las filas agregadas hasta ahora."""
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.touched = [False] * n
+        self.components = 0
+
+    def root(self, j):
+        parent = self.parent
+        while parent[j] != j:
+            parent[j] = parent[parent[j]]
+            j = parent[j]
+        return j
+
+    def merged(self, row_cols):
+        """Componentes que quedarían al agregar una fila con columnas ``row_cols``."""
+        roots = {self.root(j) for j in row_cols if self.touched[j]}
+        fresh = sum(1 for j in row_cols if not self.touched[j])
+        return self.components - len(roots) + (1 if roots or fresh else 0)
+
+    def add(self, row_cols):
+        self.components = self.merged(row_cols)
+        first = None
+        for j in row_cols:
+            self.touched[j] = True
+            j = self.root(j)
+            if first is None:
+                first = j
+            elif j != first:
+                self.parent[j] = first
+
+
+def coupling_rows(A):
+    """Filas cuyo retiro parte el grafo filas-columnas en al menos dos componentes.
+
+    Las filas se agregan de la más dispersa a la más densa y se corta en el
+    último punto con dos o más componentes; las filas que faltaban son
+    candidatas. Después cada candidata, también de la más dispersa a la más
+    densa, vuelve al grafo si con ella siguen quedando dos componentes: solo
+    quedan acoplantes las que unirían todo (la fila densa de una familia
+    dominante vuelve a su bloque). Sin corte posible devuelve ninguna fila.
+    """
+    A = as_matrix(A)
+    m, n = A.shape
+    rows, cols, _ = triplets(A)
+    counts = np.bincount(rows, minlength=m)
+    order = np.argsort(counts, kind='stable')
+    by_row = np.split(cols[np.argsort(rows, kind='stable')], np.cumsum(counts)[:-1])
+    by_row = [row_cols.tolist() for row_cols in by_row]
+
+    sweep, cut = _UnionFind(n), None
+    for position, i in enumerate(order):
+        sweep.add(by_row[i])
+        if sweep.components >= 2:
+            cut = position
+    coupling = np.zeros(m, dtype=bool)
+    if cut is None:
+        return coupling
+
+    graph = _UnionFind(n)
+    for i in order[:cut + 1]:
+        graph.add(by_row[i])
+    for i in order[cut + 1:]:
+        if graph.merged(by_row[i]) >= 2:
+            graph.add(by_row[i])
+        else:
+            coupling[i] = True
+    return coupling
+
+
+def find_blocks(A, coupling=None):
+    """Filas acoplantes, bloques ``(filas, columnas)`` y columnas que solo aparecen en filas acoplantes."""
+    A = as_matrix(A)
+    m, n = A.shape
+    rows, cols, _ = triplets(A)
+    coupling = coupling_rows(A) if coupling is None else np.asarray(coupling, dtype=bool)
+    labels, linked = _components(m, n, rows, cols, coupling)
+    live = ~coupling[rows]
+    r, j = rows[live], cols[live]
+    blocks = []
+    for label in np.unique(labels[linked]):
+        block_cols = np.flatnonzero(linked & (labels == label))
+        block_rows = np.unique(r[labels[j] == label])
+        blocks.append((block_rows, block_cols))
+    return BlockStructure(np.flatnonzero(coupling), blocks, np.flatnonzero(~linked))
+
+
+def _submatrix(A, rows, cols):
+    if not isinstance(A, CSRMatrix):
+        return A[np.ix_(rows, cols)]
+    new_row = np.full(A.shape[0], -1)
+    new_row[rows] = np.arange(len(rows))
+    new_col = np.full(A.shape[1], -1)
+    new_col[cols] = np.arange(len(cols))
+    keep = (new_row[A.row_ids] >= 0) & (new_col[A.indices] >= 0)
+    return CSRMatrix(new_row[A.row_ids[keep]], new_col[A.indices[keep]], A.data[keep], (len(rows), len(cols)))
+
+
+def _combine(n, free, proposals, weights):
+    """Solución del modelo completo a partir de las columnas libres y las propuestas ponderadas."""
+    x = np.zeros(n)
+    x[free] = weights[:len(free)]
+    for weight, (_, proposal, _, _) in zip(weights[len(free):], proposals):
+        x += weight * proposal
+    return x
+
+
+def _init_worker(blocks):
+    global _worker_blocks
+    _worker_blocks = blocks
+
+
+def _solve_block(task):
+    k, cost, basis = task
+    A, b = _worker_blocks[k]
+    result = solve_lp(cost, A, b, basis=basis, record=False)
+    return result.status, result.x, result.objective, result.basis, result.iterations
+
+
+def solve_decomposed(c, A, b, structure=None, record=True, max_iter=None, progress=None, processes=None):
+    """Dantzig-Wolfe con subproblemas en paralelo; sin bloques separables resuelve con el simplex."""
+    c = np.asarray(c, dtype=float)
+    A = as_matrix(A)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    structure = structure or find_blocks(A)
+    if not structure.separable or (b < 0).any():
+        reason = 'lados derechos negativos' if structure.separable else f'{len(structure.blocks)} bloque(s) separable(s)'
+        logger.warning('Descomposición %dx%d sin aplicar (%s); se resuelve con el simplex', m, n, reason)
+        return solve_lp(c, A, b, record=record, max_iter=max_iter, progress=progress)
+
+    coupling, free = structure.coupling, structure.free
+    blocks = [(_submatrix(A, rows, cols), b[rows]) for rows, cols in structure.blocks]
+    block_cols = [cols for _, cols in structure.blocks]
+    K = len(blocks)
+    coupling_of = lambda x: (A @ x)[coupling]
+    processes = processes or os.cpu_count() or 1
+    _init_worker(blocks)
+
+    # Columnas del maestro: las libres tal cual y una por propuesta (bloque, x, c·x, A_acoplante x)
+    proposals = []
+    block_bases = [None] * K
+    free_A = A[:, free][coupling] if len(free) else np.zeros((len(coupling), 0))
+    pi, mu = np.zeros(m), np.zeros(K)
+    history, iterates, master_basis, master_pivots, sub_pivots = [], [], None, 0, 0
+    previous_columns = 0
+    pool = None
+    status = 'optimal'
+    try:
+        for round_ in range(1, MAX_ROUNDS + 1):
+            reduced = c - pi @ A
+            tasks = [(k, reduced[block_cols[k]], block_bases[k]) for k in range(K)]
+            if processes > 1 and n >= POOL_MIN_COLUMNS:
+                if pool is None:
+                    pool = ProcessPoolExecutor(min(processes, K), initializer=_init_worker, initargs=(blocks,))
+                solved = list(pool.map(_solve_block, tasks))
+            else:
+                solved = [_solve_block(task) for task in tasks]
+            if any(st != 'optimal' for st, *_ in solved):
+                # Bloque no acotado o con problemas numéricos: el modelo completo con el simplex
+                status = next(st for st, *_ in solved if st != 'optimal')
+                break
+
+            improved = False
+            for k, (_, x_k, objective, basis, pivots) in enumerate(solved):
+                block_bases[k] = basis
+                sub_pivots += pivots
+                if round_ == 1 or objective - mu[k] > TOL * (1 + abs(objective)):
+                    x = np.zeros(n)
+                    x[block_cols[k]] = x_k
+                    proposals.append((k, x, c @ x, coupling_of(x)))
+                    improved = True
+            if not improved:
+                break
+
+            # Maestro: filas acoplantes más una fila de convexidad por bloque
+            P = len(proposals)
+            master_A = np.zeros((len(coupling) + K, len(free) + P))
+            master_A[:len(coupling), :len(free)] = free_A
+            master_c = np.concatenate([c[free], [value for _, _, value, _ in proposals]])
+            for p, (k, _, _, column) in enumerate(proposals):
+                master_A[:len(coupling), len(free) + p] = column
+                master_A[len(coupling) + k, len(free) + p] = 1.0
+            master_b = np.concatenate([b[coupling], np.ones(K)])
+            if master_basis is not None:
+                # Las holguras se corren por las columnas nuevas
+                added = master_A.shape[1] - previous_columns
+                master_basis = np.where(master_basis >= previous_columns, master_basis + added, master_basis)
+            master = solve_lp(master_c, master_A, master_b, basis=master_basis, record=False)
+            if not master.optimal:
+                status = master.status
+                break
+            master_basis, previous_columns = master.basis, master_A.shape[1]
+            master_pivots += master.iterations
+            history.append(master.objective)
+            if record:
+                iterates.append(_combine(n, free, proposals, master.x))
+            if progress is not None:
+                progress(round_, master.objective)
+            pi[coupling] = master.duals[:len(coupling)]
+            mu = master.duals[len(coupling):]
+        else:
+            status = 'iteration_limit'
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if status != 'optimal' or master_basis is None:
+        logger.warning('Descomposición %dx%d interrumpida (%s); se resuelve con el simplex', m, n, status)
+        return solve_lp(c, A, b, record=record, max_iter=max_iter, progress=progress)
+
+    x = _combine(n, free, proposals, master.x)
+    basis = crossover_basis(A, x, b - A @ x)
+    result = solve_lp(c, A, b, basis=basis, record=record, max_iter=max_iter)
+    result.engine = 'decomposition'
+    result.iterations += master_pivots + sub_pivots
+    result.z_history = np.concatenate([history, result.z_history])
+    if record:
+        result.x_history = np.vstack([np.reshape(iterates, (-1, n)), result.x_history])
+    return result
@@ -0,0 +1,32 @@
+"""Selección del motor de resolución: simplex, punto interior o descomposición."""
+from .decomposition import solve_decomposed
+from .interior import solve_interior
+from .simplex import solve_lp
+from .sparse import as_matrix
+
+ENGINES = ('auto', 'simplex', 'interior', 'decomposition')
+# Con al menos estas columnas (y sin base de arranque) el motor automático usa punto interior...
+INTERIOR_MIN_COLUMNS = 5000
+# ...salvo que A D Aᵀ (filas × filas, Cholesky denso O(m³) por iteración) pase de este tamaño
+INTERIOR_MAX_ROWS = 1000
+
+
+def choose_engine(A, basis=None):
+    m, n = A.shape
+    if basis is None and n >= INTERIOR_MIN_COLUMNS and m <= INTERIOR_MAX_ROWS:
+        return 'interior'
+    return 'simplex'
+
+
+def solve(c, A, b, engine='auto', **options):
+    """Resuelve con ``engine`` ('simplex', 'interior', 'decomposition' o 'auto' según el tamaño)."""
+    if engine not in ENGINES:
+        raise ValueError(f'Motor desconocido: {engine}')
+    A = as_matrix(A)
+    if engine == 'auto':
+        engine = choose_engine(A, options.get('basis'))
+    if engine in ('interior', 'decomposition'):
+        options.pop('basis', None)
+        options.pop('basis_inverse', None)
+        return (solve_interior if engine == 'interior' else solve_decomposed)(c, A, b, **options)
+    return solve_lp(c, A, b, **options)
@@ -0,0 +1,161 @@
+"""Punto interior primal-dual (predictor-corrector de Mehrotra) con crossover.
+
+Trabaja sobre la forma estándar ``min -c·x, A x + s = b, (x, s) >= 0``. Cada
+iteración arma las ecuaciones normales ``A D Aᵀ Δy = r`` y las factoriza una
+vez con Cholesky de LAPACK para el predictor y el corrector. Con ``A`` en CSR
+no se densifica: ``A D Aᵀ`` se acumula desde los productos de no ceros que
+comparten columna, así que armarla cuesta según los no ceros de ``A``. La
+factorización sí es densa de m × m y cuesta O(m³) por iteración, por eso el
+motor automático solo elige punto interior con pocas filas (``lp.engines``).
+Al terminar, el crossover elige una base con las variables más grandes del
+punto interior y el simplex termina desde ahí: el resultado es un vértice con
+base e inversa, como el del simplex, para que precios sombra, rangos y
+escenarios funcionen igual.
+"""
+import numpy as np
+
+from .simplex import solve_lp
+from .sparse import CSRMatrix, as_matrix
+
+STEP = 0.995
+
+
+def _normal_pairs(A):
+    """Pares de no ceros de cada columna de ``A`` (CSR): ``(posición en M, columna, a_ij·a_kj)``."""
+    m = A.shape[0]
+    lengths = np.diff(A.col_ptr)[A.csc_cols]
+    first = np.repeat(np.arange(len(A.csc_data)), lengths)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    second = A.col_ptr[A.csc_cols[first]] + np.arange(len(first)) - starts
+    return A.csc_rows[first] * m + A.csc_rows[second], A.csc_cols[first], A.csc_data[first] * A.csc_data[second]
+
+
+def _normal_matrix(A, dx, ds, pairs=None):
+    """``A diag(dx) Aᵀ + diag(ds)``; con ``A`` disperso se acumula desde ``pairs`` (de ``_normal_pairs``)."""
+    if isinstance(A, CSRMatrix):
+        m = A.shape[0]
+        position, column, product = pairs
+        M = np.bincount(position, weights=product * dx[column], minlength=m * m).reshape(m, m)
+    else:
+        M = (A * dx) @ A.T
+    M[np.diag_indices_from(M)] += ds
+    return M
+
+
+def _factor_normal(M):
+    """Inversa del factor de Cholesky de ``M``: una factorización por iteración sirve a predictor y corrector."""
+    try:
+        factor = np.linalg.cholesky(M)
+    except np.linalg.LinAlgError:
+        # Casi singular cerca del óptimo: regularización mínima de la diagonal
+        M = M + np.eye(len(M)) * 1e-10 * max(1.0, np.abs(np.diag(M)).max())
+        factor = np.linalg.cholesky(M)
+    return np.linalg.inv(factor)
+
+
+def _solve_normal(inverse, rhs):
+    return inverse.T @ (inverse @ rhs)
+
+
+def interior_point(c, A, b, tol=1e-8, max_iter=200, progress=None, record=False):
+    """Devuelve ``(status, x, s, duals, iteraciones, objetivos, iterados)``; los iterados solo con ``record``."""
+    c = np.asarray(c, dtype=float)
+    A = as_matrix(A)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    cost = -c
+    # La estructura de A D Aᵀ es la misma en todas las iteraciones; solo cambia D
+    pairs = _normal_pairs(A) if isinstance(A, CSRMatrix) else None
+
+    # Punto inicial de Mehrotra
+    M = _factor_normal(_normal_matrix(A, np.ones(n), np.ones(m), pairs))
+    w = _solve_normal(M, b)
+    x, s = w @ A, w.copy()
+    y = _solve_normal(M, A @ cost)
+    zx, zs = cost - y @ A, -y
+    shift = max(-min(x.min(), s.min()), 0.0) + 1.0
+    x, s = x + shift, s + shift
+    shift = max(-min(zx.min(), zs.min()), 0.0) + 1.0
+    zx, zs = zx + shift, zs + shift
+
+    history, iterates = [], []
+    for iteration in range(1, max_iter + 1):
+        rp = b - A @ x - s
+        rdx = cost - y @ A - zx
+        rds = -y - zs
+        gap = x @ zx + s @ zs
+        mu = gap / (n + m)
+        objective = float(c @ x)
+        history.append(objective)
+        if record:
+            iterates.append(x.copy())
+        if progress is not None:
+            progress(iteration, objective)
+        if (np.linalg.norm(rp) <= tol * (1 + np.linalg.norm(b))
+                and max(np.linalg.norm(rdx), np.linalg.norm(rds)) <= tol * (1 + np.linalg.norm(c))
+                and gap <= tol * (1 + abs(objective))):
+            return 'optimal', x, s, -y, iteration, history, iterates
+        if not np.isfinite(mu) or mu > 1e30:
+            return 'unbounded', x, s, -y, iteration, history, iterates
+
+        dx, ds = x / zx, s / zs
+        M = _factor_normal(_normal_matrix(A, dx, ds, pairs))
+
+        def direction(rcx, rcs):
+            rhs = rp - A @ (rcx / zx - dx * rdx) - (rcs / zs - ds * rds)
+            dy = _solve_normal(M, rhs)
+            dzx = rdx - dy @ A
+            dzs = rds - dy
+            return rcx / zx - dx * dzx, rcs / zs - ds * dzs, dy, dzx, dzs
+
+        def steps(px, ps, dzx, dzs):
+            ratio = lambda v, d: np.min(-v[d < 0] / d[d < 0]) if (d < 0).any() else np.inf
+            return min(1.0, ratio(x, px), ratio(s, ps)), min(1.0, ratio(zx, dzx), ratio(zs, dzs))
+
+        # Predictor (afín) y corrector con centrado σ = (μ_afín / μ)^3
+        px, ps, dy, dzx, dzs = direction(-x * zx, -s * zs)
+        ap, ad = steps(px, ps, dzx, dzs)
+        mu_aff = ((x + ap * px) @ (zx + ad * dzx) + (s + ap * ps) @ (zs + ad * dzs)) / (n + m)
+        sigma = (mu_aff / mu) ** 3
+        px, ps, dy, dzx, dzs = direction(sigma * mu - x * zx - px * dzx, sigma * mu - s * zs - ps * dzs)
+        ap, ad = steps(px, ps, dzx, dzs)
+        ap, ad = min(1.0, STEP * ap), min(1.0, STEP * ad)
+        x, s = x + ap * px, s + ap * ps
+        y, zx, zs = y + ad * dy, zx + ad * dzx, zs + ad * dzs
+    return 'iteration_limit', x, s, -y, max_iter, history, iterates
+
+
+def crossover_basis(A, x, s, tol=1e-9):
+    """Base de columnas linealmente independientes de ``[A I]``, de mayor a menor valor en el punto interior."""
+    m, n = A.shape
+    values = np.concatenate([x, s])
+    Q = np.zeros((m, m))
+    basis = []
+    for j in np.argsort(-values, kind='stable'):
+        if len(basis) == m:
+            break
+        if j < n:
+            column = A[:, j]
+        else:
+            column = np.zeros(m)
+            column[j - n] = 1.0
+        residual = column - Q[:, :len(basis)] @ (Q[:, :len(basis)].T @ column)
+        norm = np.linalg.norm(residual)
+        if norm > tol * max(1.0, np.linalg.norm(column)):
+            Q[:, len(basis)] = residual / norm
+            basis.append(j)
+    return np.array(basis, dtype=int) if len(basis) == m else None
+
+
+def solve_interior(c, A, b, record=True, max_iter=None, progress=None):
+    """Punto interior + crossover; devuelve un ``LPResult`` con base óptima."""
+    A = as_matrix(A)
+    status, x, s, duals, iterations, history, iterates = interior_point(c, A, b, progress=progress, record=record)
+    basis = crossover_basis(A, x, s) if status == 'optimal' else None
+    result = solve_lp(c, A, b, basis=basis, record=record, max_iter=max_iter)
+    result.engine = 'interior'
+    result.iterations += iterations
+    result.z_history = np.concatenate([history, result.z_history])
+    if record:
+        result.x_history = np.vstack([np.reshape(iterates, (-1, A.shape[1])), result.x_history])
+    return result
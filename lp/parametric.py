@@ -0,0 +1,81 @@
+"""Programación paramétrica sobre el lado derecho de una restricción.
+
+Para ``b[row] = t`` la utilidad óptima es lineal a trozos y cóncava en ``t``.
+Partiendo de la base óptima, dentro de cada base ``x_B(t)`` varía linealmente
+con la columna ``row`` de la inversa, así que el siguiente punto de quiebre se
+obtiene con una prueba de razón; ahí basta un pivote dual para pasar a la base
+siguiente. Un solo recorrido hacia cada lado da la curva exacta completa.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .simplex import TOL, RevisedSimplex
+
+MAX_PIECES = 1000
+
+
+@dataclass
+class ParametricResult:
+    rhs: np.ndarray
+    objective: np.ndarray
+    slopes: np.ndarray
+    row: int
+
+    def evaluate(self, t):
+        return np.interp(t, self.rhs, self.objective, left=np.nan, right=np.nan)
+
+    def segment(self, t):
+        """Intervalo de ``rhs`` donde el precio sombra vigente en ``t`` es válido."""
+        i = int(np.clip(np.searchsorted(self.rhs, t, side='right') - 1, 0, len(self.slopes) - 1))
+        return self.rhs[i], self.rhs[i + 1]
+
+
+def _sweep(c, A, b, base, row, bound, direction):
+    solver = RevisedSimplex(c, A, b.copy(), basis=base.basis, record=False)
+    t = float(b[row])
+    points = []
+    slopes = []
+    for _ in range(MAX_PIECES):
+        x_b = solver._x_basic()
+        e = direction * solver.binv[:, row]
+        slope = solver._duals(solver.cost)[row]
+        mask = e < -TOL
+        ratios = np.full(solver.m, np.inf)
+        ratios[mask] = np.maximum(x_b[mask], 0.0) / -e[mask]
+        step = ratios.min()
+        remaining = direction * (bound - t)
+        if step >= remaining:
+            t = bound
+            solver.b[row] = t
+            points.append((t, float(solver.c @ solver._full_x()[:solver.n])))
+            slopes.append(slope)
+            break
+        t += direction * step
+        solver.b[row] = t
+        points.append((t, float(solver.c @ solver._full_x()[:solver.n])))
+        slopes.append(slope)
+        if not solver.dual_pivot(int(np.argmin(ratios))):
+            # Más allá de t el modelo es infactible
+            break
+    return points, slopes
+
+
+def rhs_parametric(c, A, b, base, row, lower, upper):
+    """Curva exacta de utilidad óptima para ``b[row]`` entre ``lower`` y ``upper``."""
+    b = np.asarray(b, dtype=float)
+    t0 = float(b[row])
+    start = float(np.asarray(c, dtype=float) @ base.x)
+    up, up_slopes = _sweep(c, A, b, base, row, max(upper, t0), 1.0)
+    down, down_slopes = _sweep(c, A, b, base, row, min(lower, t0), -1.0)
+    points = down[::-1] + [(t0, start)] + up
+    slopes = down_slopes[::-1] + up_slopes
+    rhs = np.array([p[0] for p in points])
+    objective = np.array([p[1] for p in points])
+    # Quiebres degenerados (paso cero) no aportan segmentos
+    keep = np.concatenate([[True], np.diff(rhs) > TOL])
+    rhs, objective, slopes = rhs[keep], objective[keep], np.array(slopes)[keep[1:]]
+    # El punto de partida y los cambios de base sin cambio de pendiente no son quiebres
+    same = np.abs(np.diff(slopes)) <= TOL * np.maximum(1.0, np.abs(slopes[1:]))
+    inner = np.concatenate([[True], ~same, [True]])
+    return ParametricResult(rhs[inner], objective[inner], slopes[np.concatenate([~same, [True]])], row)
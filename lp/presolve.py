@@ -0,0 +1,186 @@
+"""Presolve para ``max c·x, A x <= b, x >= 0``.
+
+Antes del simplex se quitan filas y columnas que no pueden cambiar el
+óptimo; después la solución reducida se lleva de vuelta al problema original
+(postsolve) con su base completa, para que rangos, escenarios y arranques en
+caliente sigan funcionando sobre el modelo sin reducir.
+
+Reducciones, repetidas hasta que no haya cambios:
+
+- filas vacías con ``b >= 0`` y filas singleton ``a·x_j <= b`` con ``a < 0``,
+  ``b >= 0`` (ya implicadas por ``x_j >= 0``);
+- columnas vacías o dominadas (``c_j <= 0`` y consumo no negativo): se fijan
+  en ``x_j = 0``;
+- filas redundantes: con las cotas ``x_j <= u_j`` implicadas por las demás
+  filas no negativas (las singleton ``a·x_j <= b`` son cotas directas), su
+  actividad máxima no alcanza ``b``.
+
+Solo se fijan columnas en cero, así que la base reducida más las holguras de
+las filas quitadas es una base óptima del problema original.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .engines import solve
+from .simplex import TOL, LPResult
+from .sparse import CSRMatrix, as_matrix, triplets
+
+
+@dataclass
+class Presolved:
+    c: np.ndarray
+    A: np.ndarray
+    b: np.ndarray
+    rows: np.ndarray
+    cols: np.ndarray
+    original: tuple
+
+    @property
+    def reduced(self):
+        return len(self.rows) < self.original[1].shape[0] or len(self.cols) < self.original[1].shape[1]
+
+    def postsolve(self, result):
+        """Lleva un ``LPResult`` del problema reducido al original."""
+        c, A, b = self.original
+        m, n = A.shape
+        k = len(self.rows)
+        x = np.zeros(n)
+        x[self.cols] = result.x
+        duals = np.zeros(m)
+        duals[self.rows] = result.duals
+
+        # Base completa: la reducida en índices originales y la holgura de cada fila quitada
+        dropped = np.setdiff1d(np.arange(m), self.rows)
+        structural = result.basis < len(self.cols)
+        mapped = np.where(structural, self.cols[np.minimum(result.basis, len(self.cols) - 1)],
+                          n + self.rows[np.maximum(result.basis - len(self.cols), 0)])
+        basis = np.concatenate([mapped, n + dropped])
+
+        # Inversa por bloques: P·B = [[B_r, 0], [D, I]] con P = filas conservadas primero
+        D = np.zeros((len(dropped), k))
+        if len(dropped) and structural.any():
+            columns = A[:, mapped[structural]]
+            D[:, structural] = columns[dropped]
+        block = np.zeros((m, m))
+        block[:k, :k] = result.basis_inverse
+        block[k:, :k] = -D @ result.basis_inverse
+        block[k:, k:] = np.eye(len(dropped))
+        binv = np.empty((m, m))
+        binv[:, np.concatenate([self.rows, dropped])] = block
+
+        reduced_costs = c - duals @ A
+        reduced_costs[basis[basis < n]] = 0.0
+        history = result.x_history
+        if len(history):
+            full = np.zeros((len(history), n))
+            full[:, self.cols] = history
+            history = full
+        else:
+            history = np.empty((0, n))
+        return LPResult(
+            status=result.status,
+            x=x,
+            objective=float(c @ x),
+            duals=duals,
+            reduced_costs=reduced_costs,
+            slack=b - A @ x,
+            basis=basis,
+            iterations=result.iterations,
+            z_history=result.z_history,
+            x_history=history,
+            basis_inverse=binv,
+            engine=result.engine,
+        )
+
+
+def presolve(c, A, b):
+    c = np.asarray(c, dtype=float)
+    A = as_matrix(A)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    rows, cols, vals = triplets(A)
+    keep_row = np.ones(m, dtype=bool)
+    keep_col = np.ones(n, dtype=bool)
+
+    changed = True
+    while changed:
+        changed = False
+        live = keep_row[rows] & keep_col[cols]
+        r, j, a = rows[live], cols[live], vals[live]
+        row_count = np.bincount(r, minlength=m)
+
+        # Filas vacías o singleton ya implicadas por x >= 0
+        negative_single = np.zeros(m, dtype=bool)
+        negative_single[r[(row_count[r] == 1) & (a < 0)]] = True
+        drop = keep_row & (b >= 0) & ((row_count == 0) | negative_single)
+
+        # Columnas vacías o dominadas: no aportan al objetivo y solo consumen recursos
+        has_negative = np.zeros(n, dtype=bool)
+        has_negative[j[a < 0]] = True
+        fixed = keep_col & (c <= 0) & ~has_negative
+        if fixed.any():
+            keep_col &= ~fixed
+            changed = True
+        if drop.any():
+            keep_row &= ~drop
+            changed = True
+        if changed:
+            continue
+
+        # Filas redundantes, de a una: las cotas no deben venir de la fila que se quita
+        changed = _drop_redundant(r, j, a, b, keep_row, keep_col, m, n)
+
+    kept_rows, kept_cols = np.flatnonzero(keep_row), np.flatnonzero(keep_col)
+    live = keep_row[rows] & keep_col[cols]
+    new_row = np.cumsum(keep_row) - 1
+    new_col = np.cumsum(keep_col) - 1
+    if isinstance(A, CSRMatrix):
+        reduced = CSRMatrix(new_row[rows[live]], new_col[cols[live]], vals[live], (len(kept_rows), len(kept_cols)))
+    else:
+        reduced = A[np.ix_(kept_rows, kept_cols)]
+    return Presolved(c[kept_cols], reduced, b[kept_rows], kept_rows, kept_cols, (c, A, b))
+
+
+def _drop_redundant(r, j, a, b, keep_row, keep_col, m, n):
+    nonnegative_row = np.ones(m, dtype=bool)
+    nonnegative_row[r[a < 0]] = False
+    source = keep_row[r] & nonnegative_row[r] & (a > 0) & (b[r] >= 0)
+    # Cota por columna desde cada fila no negativa; se guardan la mejor y la segunda
+    ratios = np.where(source, b[r] / np.where(a > 0, a, 1.0), np.inf)
+    first = np.full(n, np.inf)
+    first_row = np.full(n, -1)
+    second = np.full(n, np.inf)
+    if len(j):
+        order = np.lexsort((ratios, j))
+        sorted_cols = j[order]
+        starts = np.flatnonzero(np.r_[True, sorted_cols[1:] != sorted_cols[:-1]])
+        head = order[starts]
+        first[j[head]], first_row[j[head]] = ratios[head], r[head]
+        nxt = np.minimum(starts + 1, len(order) - 1)
+        paired = (starts + 1 < len(order)) & (sorted_cols[nxt] == sorted_cols[starts])
+        second[j[head[paired]]] = ratios[order[nxt[paired]]]
+
+    # Actividad máxima de cada fila con cotas que no salen de ella misma
+    bound = np.where(first_row[j] == r, second[j], first[j])
+    contribution = np.where(a > 0, a * bound, 0.0)
+    with np.errstate(invalid='ignore'):
+        activity = np.bincount(r, weights=np.where(np.isfinite(contribution), contribution, 0.0), minlength=m)
+    unbounded = np.zeros(m, dtype=bool)
+    unbounded[r[~np.isfinite(contribution)]] = True
+    margin = np.where(keep_row & ~unbounded, b - activity, -np.inf)
+    best = int(np.argmax(margin))
+    if margin[best] >= -TOL * max(1.0, abs(b[best])):
+        keep_row[best] = False
+        return True
+    return False
+
+
+def solve_presolved(c, A, b, engine='auto', **options):
+    """``solve`` con presolve: resuelve el problema reducido y devuelve el resultado del original."""
+    reduced = presolve(c, A, b)
+    if not reduced.reduced:
+        return solve(c, A, b, engine, **options)
+    if len(reduced.cols) == 0 or len(reduced.rows) == 0:
+        return solve(c, A, b, engine, **options)
+    return reduced.postsolve(solve(reduced.c, reduced.A, reduced.b, engine, **options))
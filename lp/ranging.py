@@ -0,0 +1,60 @@
+"""Análisis de rangos a partir de la inversa de la base óptima.
+
+Se calculan a la vez, con operaciones matriciales, los rangos de todos los
+coeficientes objetivo (dentro de los cuales la base sigue siendo óptima) y de
+todos los lados derechos (dentro de los cuales la base sigue siendo factible
+y los precios sombra no cambian). El costo es O(m·n), sin volver a resolver.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .simplex import TOL
+from .sparse import as_matrix
+
+
+@dataclass
+class Ranging:
+    cost_lower: np.ndarray
+    cost_upper: np.ndarray
+    rhs_lower: np.ndarray
+    rhs_upper: np.ndarray
+
+
+def _bounds(values, directions):
+    """Para cada columna, el menor y mayor desplazamiento ``δ`` con ``values + δ·directions >= 0``."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = -values / directions
+    lower = np.where(directions > TOL, ratios, -np.inf).max(axis=0)
+    upper = np.where(directions < -TOL, ratios, np.inf).min(axis=0)
+    return lower, upper
+
+
+def compute_ranging(c, A, b, result):
+    A = as_matrix(A)
+    c = np.asarray(c, dtype=float)
+    m, n = A.shape
+    basis, binv = result.basis, result.basis_inverse
+    x_basic = binv @ np.asarray(b, dtype=float)
+
+    # Lados derechos: x_B + δ·B⁻¹e_i >= 0
+    rhs_low, rhs_up = _bounds(x_basic[:, None], binv)
+    rhs_lower = b + rhs_low
+    rhs_upper = b + rhs_up
+
+    # Costos de variables no básicas: pueden subir hasta anular su costo reducido
+    cost_lower = np.full(n, -np.inf)
+    cost_upper = c - np.minimum(result.reduced_costs, 0.0)
+
+    # Costos de variables básicas: d_k - δ·(B⁻¹[A I])_rk <= 0 para toda no básica k
+    structural = np.flatnonzero(basis < n)
+    if structural.size:
+        reduced = np.concatenate([result.reduced_costs, -result.duals])
+        reduced[basis] = 0.0
+        tableau = np.hstack([binv[structural] @ A, binv[structural]])
+        tableau[:, basis] = 0.0
+        low, up = _bounds(-reduced[:, None], tableau.T)
+        cols = basis[structural]
+        cost_lower[cols] = c[cols] + low
+        cost_upper[cols] = c[cols] + up
+    return Ranging(cost_lower, cost_upper, rhs_lower, rhs_upper)
@@ -0,0 +1,83 @@
+"""Evaluación por lotes de escenarios sobre una base óptima.
+
+Cada escenario cambia el lado derecho y/o los coeficientes objetivo. Primero
+se comprueba, para todos los escenarios a la vez, si la base óptima original
+sigue siendo primal y dual factible: en ese caso la solución se obtiene con
+un par de productos matriciales, sin pivotes. Solo los escenarios que cambian
+de base se resuelven de nuevo, arrancando en caliente desde la base original,
+y si son muchos se reparten en un pool de procesos.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .simplex import TOL, solve_lp
+from .sparse import as_matrix
+
+POOL_THRESHOLD = 64
+
+_worker_A = None
+_worker_basis = None
+
+
+@dataclass
+class BatchResult:
+    status: np.ndarray
+    objective: np.ndarray
+    x: np.ndarray
+    duals: np.ndarray
+    iterations: np.ndarray
+    warm_hits: int
+
+
+def _init_worker(A, basis):
+    global _worker_A, _worker_basis
+    _worker_A = A
+    _worker_basis = basis
+
+
+def _solve_one(task):
+    c, b = task
+    result = solve_lp(c, _worker_A, b, basis=_worker_basis, record=False)
+    return result.status, result.x, result.duals, result.iterations
+
+
+def solve_batch(c, A, b, base, costs=None, rhs=None, processes=None):
+    """Resuelve ``k`` variantes del modelo; ``costs`` es (k, n) y ``rhs`` es (k, m)."""
+    A = as_matrix(A)
+    m, n = A.shape
+    k = len(costs) if costs is not None else len(rhs)
+    C = np.broadcast_to(np.asarray(c, dtype=float), (k, n)) if costs is None else np.asarray(costs, dtype=float)
+    R = np.broadcast_to(np.asarray(b, dtype=float), (k, m)) if rhs is None else np.asarray(rhs, dtype=float)
+    basis, binv = base.basis, base.basis_inverse
+
+    # Verificación vectorizada de la base óptima original
+    x_basic = R @ binv.T
+    cost_basic = np.hstack([C, np.zeros((k, m))])[:, basis]
+    duals = cost_basic @ binv
+    reduced = np.hstack([C - duals @ A, -duals])
+    reduced[:, basis] = 0.0
+    keep = (x_basic.min(axis=1) >= -TOL) & (reduced.max(axis=1) <= TOL)
+
+    x_full = np.zeros((k, n + m))
+    x_full[:, basis] = x_basic
+    x = x_full[:, :n]
+    status = np.full(k, 'optimal', dtype=object)
+    iterations = np.zeros(k, dtype=int)
+
+    pending = np.flatnonzero(~keep)
+    tasks = [(C[i], R[i]) for i in pending]
+    processes = processes or os.cpu_count() or 1
+    if len(tasks) >= POOL_THRESHOLD and processes > 1:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(A, basis)) as pool:
+            solved = list(pool.map(_solve_one, tasks, chunksize=max(1, len(tasks) // (4 * processes))))
+    else:
+        _init_worker(A, basis)
+        solved = [_solve_one(task) for task in tasks]
+    for i, (st, xi, yi, its) in zip(pending, solved):
+        status[i], x[i], duals[i], iterations[i] = st, xi, yi, its
+
+    objective = np.einsum('ij,ij->i', C, x)
+    return BatchResult(status, objective, x, duals, iterations, int(keep.sum()))
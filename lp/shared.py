@@ -0,0 +1,175 @@
+"""Almacén de arreglos compartido entre procesos por archivos mapeados en memoria.
+
+Cada entrada es un archivo con un encabezado JSON (estructura del valor y
+ubicación de cada arreglo) seguido de los datos de los arreglos alineados a
+64 bytes. Al leer, el archivo se mapea con ``np.memmap`` y los arreglos son
+vistas de solo lectura sobre ese mapa: todos los procesos que leen la misma
+entrada comparten las mismas páginas (en ``/dev/shm`` es memoria compartida
+directamente), así que la memoria crece con el tamaño del modelo y no con
+tamaño × workers.
+
+Se guardan valores hechos de ``None``, escalares, cadenas, ``ndarray``
+numéricos, ``CSRMatrix``, tuplas, listas, diccionarios y las dataclasses de
+``DATACLASSES``. Al leer solo se reconstruyen esos tipos: el encabezado nunca
+decide qué código se importa. El directorio debe ser del usuario actual, no un
+enlace simbólico y sin escritura para grupo u otros; si no existe se crea con
+modo 0o700.
+"""
+import dataclasses
+import json
+import os
+import struct
+
+import numpy as np
+
+from ._io import atomic_write, owned, private_directory
+from .branch_bound import IntegerResult
+from .ranging import Ranging
+from .simplex import LPResult
+from .sparse import CSRMatrix
+
+MAGIC = b'LPSHM1\0\0'
+ALIGN = 64
+# Únicas dataclasses que se guardan y reconstruyen, por nombre
+DATACLASSES = {cls.__name__: cls for cls in (LPResult, Ranging, IntegerResult)}
+CSR_FIELDS = ('shape', 'row_ids', 'indices', 'data', 'indptr', 'csc_rows', 'csc_cols', 'csc_data', 'col_ptr')
+
+
+def _aligned(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def _encode(value, arrays):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return {'v': value}
+    if isinstance(value, np.generic):
+        return {'v': value.item()}
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError('arreglos de objetos no se pueden compartir')
+        arrays.append(np.ascontiguousarray(value))
+        return {'a': len(arrays) - 1}
+    if isinstance(value, CSRMatrix):
+        return {'csr': {name: _encode(getattr(value, name), arrays) for name in CSR_FIELDS}}
+    if type(value) in DATACLASSES.values():
+        fields = {field.name: _encode(getattr(value, field.name), arrays) for field in dataclasses.fields(value)}
+        return {'dc': type(value).__name__, 'f': fields}
+    if isinstance(value, tuple):
+        return {'t': [_encode(item, arrays) for item in value]}
+    if isinstance(value, list):
+        return {'l': [_encode(item, arrays) for item in value]}
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {'d': {key: _encode(item, arrays) for key, item in value.items()}}
+    raise TypeError(f'tipo no compartible: {type(value).__name__}')
+
+
+def _decode(spec, arrays):
+    if 'v' in spec:
+        return spec['v']
+    if 'a' in spec:
+        return arrays[spec['a']]
+    if 'csr' in spec:
+        if set(spec['csr']) != set(CSR_FIELDS):
+            raise ValueError('CSRMatrix con campos inesperados')
+        matrix = CSRMatrix.__new__(CSRMatrix)
+        vars(matrix).update({name: _decode(spec['csr'][name], arrays) for name in CSR_FIELDS})
+        return matrix
+    if 'dc' in spec:
+        cls = DATACLASSES.get(spec['dc'])
+        if cls is None:
+            raise ValueError(f"tipo no permitido: {spec['dc']}")
+        names = {field.name for field in dataclasses.fields(cls)}
+        if not set(spec['f']) <= names:
+            raise ValueError(f"campos inesperados para {spec['dc']}")
+        return cls(**{name: _decode(item, arrays) for name, item in spec['f'].items()})
+    if 't' in spec:
+        return tuple(_decode(item, arrays) for item in spec['t'])
+    if 'l' in spec:
+        return [_decode(item, arrays) for item in spec['l']]
+    return {key: _decode(item, arrays) for key, item in spec['d'].items()}
+
+
+class SharedStore:
+    """Entradas por clave en ``directory``; conserva las ``max_entries`` escritas más recientemente."""
+
+    def __init__(self, directory, max_entries=1024):
+        self.directory = private_directory(directory)
+        self.max_entries = max_entries
+
+    @classmethod
+    def from_env(cls, variable='NVIDIA_SHARED_DIR'):
+        directory = os.environ.get(variable)
+        return cls(directory) if directory else None
+
+    def _path(self, key):
+        return self.directory / f'{key}.shm'
+
+    def put(self, key, value):
+        """Publica ``value``; lanza ``TypeError`` si tiene partes que no se pueden mapear."""
+        arrays = []
+        spec = _encode(value, arrays)
+        layout, offset = [], 0
+        for array in arrays:
+            layout.append((array.dtype.str, array.shape, offset))
+            offset = _aligned(offset + array.nbytes)
+        header = json.dumps({'spec': spec, 'arrays': layout}, separators=(',', ':')).encode()
+        start = _aligned(len(MAGIC) + 8 + len(header))
+
+        with atomic_write(self._path(key)) as handle:
+            handle.write(MAGIC + struct.pack('<Q', len(header)) + header)
+            for array, (_, _, position) in zip(arrays, layout):
+                handle.seek(start + position)
+                handle.write(array.tobytes())
+            handle.truncate(start + offset)
+        self._prune()
+
+    def get(self, key):
+        try:
+            handle = open(self._path(key), 'rb')
+        except FileNotFoundError:
+            return None
+        # Todo sobre el mismo descriptor: si otro proceso reemplaza o borra la entrada, este mapa sigue válido
+        with handle:
+            prefix = handle.read(len(MAGIC) + 8)
+            if not owned(handle) or len(prefix) < len(MAGIC) + 8 or prefix[:len(MAGIC)] != MAGIC:
+                return None
+            (length,) = struct.unpack('<Q', prefix[len(MAGIC):])
+            header = json.loads(handle.read(length))
+            start = _aligned(len(MAGIC) + 8 + length)
+            size = os.fstat(handle.fileno()).st_size
+            mapped = np.memmap(handle, dtype=np.uint8, mode='r') if size > start else None
+        arrays = []
+        for dtype, shape, position in header['arrays']:
+            dtype, shape = np.dtype(dtype), tuple(shape)
+            if mapped is None or np.prod(shape) == 0:
+                arrays.append(np.empty(shape, dtype=dtype))
+            else:
+                arrays.append(np.ndarray(shape, dtype=dtype, buffer=mapped, offset=start + position))
+        try:
+            return _decode(header['spec'], arrays)
+        except (ValueError, TypeError, KeyError):
+            # Entrada de otra versión o alterada: se trata como ausente
+            return None
+
+    def _entries(self):
+        """``(archivo, stat)`` de cada entrada; otro proceso puede borrar alguna mientras tanto."""
+        entries = []
+        for path in self.directory.glob('*.shm'):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def _prune(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        # Un proceso que ya mapeó un archivo borrado sigue leyéndolo sin problemas
+        for path, _ in entries[:max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def nbytes(self):
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def clear(self):
+        for path in self.directory.glob('*.shm'):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,240 @@
+"""Simplex revisado vectorizado con NumPy.
+
+Resuelve problemas de la forma
+
+    max  c·x
+    s.a. A x <= b,  x >= 0
+
+agregando una holgura por restricción. La base se mantiene como su inversa
+explícita: se factoriza con LAPACK (LU vía ``numpy.linalg.inv``) y entre
+refactorizaciones se actualiza con una matriz eta (forma producto), de modo
+que cada pivote es una operación matricial sin bucles de Python por filas.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .sparse import as_matrix
+
+TOL = 1e-9
+REFACTOR_EVERY = 50
+DEGENERATE_LIMIT = 50
+
+
+@dataclass
+class LPResult:
+    status: str
+    x: np.ndarray
+    objective: float
+    duals: np.ndarray
+    reduced_costs: np.ndarray
+    slack: np.ndarray
+    basis: np.ndarray
+    iterations: int
+    z_history: np.ndarray
+    x_history: np.ndarray
+    basis_inverse: np.ndarray
+    engine: str = 'simplex'
+
+    @property
+    def optimal(self):
+        return self.status == 'optimal'
+
+
+class RevisedSimplex:
+    """Estado del simplex revisado: base, inversa de la base y bitácora."""
+
+    def __init__(self, c, A, b, basis=None, basis_inverse=None, record=True, max_iter=None, progress=None):
+        self.c = np.asarray(c, dtype=float)
+        self.A = as_matrix(A)
+        self.b = np.asarray(b, dtype=float)
+        self.m, self.n = self.A.shape
+        self.cost = np.concatenate([self.c, np.zeros(self.m)])
+        self.record = record
+        self.progress = progress
+        self.max_iter = max_iter if max_iter is not None else 20 * (self.n + self.m) + 100
+        self.iterations = 0
+        self.z_history = []
+        self.x_history = []
+        if basis is None:
+            basis = np.arange(self.n, self.n + self.m)
+        self.basis = np.array(basis, dtype=int)
+        if basis_inverse is not None:
+            # Inversa ya conocida (p. ej. de una solución anterior): sin refactorizar
+            self.binv = np.array(basis_inverse, dtype=float)
+            self._since_factor = 0
+            return
+        try:
+            self._factor()
+            if basis_inverse is None and not np.allclose(self._basis_matrix() @ self.binv, np.eye(self.m), atol=1e-6):
+                raise np.linalg.LinAlgError('base de arranque mal condicionada')
+        except np.linalg.LinAlgError:
+            # Base de arranque singular: se vuelve a la base de holguras
+            self.basis = np.arange(self.n, self.n + self.m)
+            self._factor()
+
+    # Álgebra de la base
+    def _column(self, j):
+        if j < self.n:
+            return self.A[:, j]
+        col = np.zeros(self.m)
+        col[j - self.n] = 1.0
+        return col
+
+    def _basis_matrix(self):
+        B = np.zeros((self.m, self.m))
+        structural = self.basis < self.n
+        B[:, structural] = self.A[:, self.basis[structural]]
+        slack_pos = np.flatnonzero(~structural)
+        B[self.basis[slack_pos] - self.n, slack_pos] = 1.0
+        return B
+
+    def _factor(self):
+        if np.array_equal(self.basis, np.arange(self.n, self.n + self.m)):
+            self.binv = np.eye(self.m)
+        else:
+            self.binv = np.linalg.inv(self._basis_matrix())
+        self._since_factor = 0
+
+    def _pivot(self, r, q, alpha):
+        row = self.binv[r] / alpha[r]
+        self.binv -= np.outer(alpha, row)
+        self.binv[r] = row
+        self.basis[r] = q
+        self._since_factor += 1
+        if self._since_factor >= REFACTOR_EVERY:
+            self._factor()
+
+    def _x_basic(self):
+        return self.binv @ self.b
+
+    def _duals(self, cost):
+        return cost[self.basis] @ self.binv
+
+    def _reduced_costs(self, cost):
+        y = self._duals(cost)
+        d = np.concatenate([cost[:self.n] - y @ self.A, cost[self.n:] - y])
+        d[self.basis] = 0.0
+        return d
+
+    def _full_x(self):
+        x = np.zeros(self.n + self.m)
+        x[self.basis] = self._x_basic()
+        return x
+
+    def _log(self):
+        x = self._full_x()[:self.n]
+        self.z_history.append(float(self.c @ x))
+        if self.record:
+            self.x_history.append(x)
+        if self.progress is not None:
+            self.progress(self.iterations, self.z_history[-1])
+
+    # Iteraciones
+    def primal(self, cost=None):
+        cost = self.cost if cost is None else cost
+        degenerate = 0
+        while self.iterations < self.max_iter:
+            d = self._reduced_costs(cost)
+            if degenerate >= DEGENERATE_LIMIT:
+                # Regla de Bland para salir de ciclos por degeneración
+                candidates = np.flatnonzero(d > TOL)
+                if candidates.size == 0:
+                    return 'optimal'
+                q = candidates[0]
+            else:
+                q = int(np.argmax(d))
+                if d[q] <= TOL:
+                    return 'optimal'
+            alpha = self.binv @ self._column(q)
+            x_b = self._x_basic()
+            mask = alpha > TOL
+            if not mask.any():
+                return 'unbounded'
+            ratios = np.full(self.m, np.inf)
+            ratios[mask] = np.maximum(x_b[mask], 0.0) / alpha[mask]
+            step = ratios.min()
+            ties = np.flatnonzero(ratios <= step + TOL)
+            r = ties[np.argmin(self.basis[ties])] if degenerate >= DEGENERATE_LIMIT else ties[np.argmax(alpha[ties])]
+            degenerate = degenerate + 1 if step <= TOL else 0
+            self._pivot(r, q, alpha)
+            self.iterations += 1
+            self._log()
+        return 'iteration_limit'
+
+    def dual(self, cost=None):
+        cost = self.cost if cost is None else cost
+        while self.iterations < self.max_iter:
+            x_b = self._x_basic()
+            r = int(np.argmin(x_b))
+            if x_b[r] >= -TOL:
+                return 'optimal'
+            if not self.dual_pivot(r, cost):
+                return 'infeasible'
+        return 'iteration_limit'
+
+    def dual_pivot(self, r, cost=None):
+        """Saca de la base la fila ``r`` con la prueba de razón dual; False si no hay entrante."""
+        cost = self.cost if cost is None else cost
+        rho = self.binv[r]
+        alpha_r = np.concatenate([rho @ self.A, rho])
+        alpha_r[self.basis] = 0.0
+        candidates = np.flatnonzero(alpha_r < -TOL)
+        if candidates.size == 0:
+            return False
+        d = np.minimum(self._reduced_costs(cost)[candidates], 0.0)
+        ratios = d / alpha_r[candidates]
+        step = ratios.min()
+        ties = candidates[ratios <= step + TOL]
+        q = int(ties[np.argmin(alpha_r[ties])])
+        alpha = self.binv @ self._column(q)
+        self._pivot(r, q, alpha)
+        self.iterations += 1
+        self._log()
+        return True
+
+    def solve(self):
+        self._log()
+        primal_feasible = self._x_basic().min() >= -TOL
+        if not primal_feasible:
+            if self._reduced_costs(self.cost).max() <= TOL:
+                status = self.dual()
+                return self.result(status)
+            # Fase 1: costos que hacen dual factible la base actual
+            phase1 = -1.0 - 1e-3 * np.linspace(0.0, 1.0, self.n + self.m)
+            phase1[self.basis] = 0.0
+            status = self.dual(phase1)
+            if status != 'optimal':
+                return self.result(status)
+        return self.result(self.primal())
+
+    def result(self, status):
+        x = self._full_x()
+        y = self._duals(self.cost)
+        d = self._reduced_costs(self.cost)
+        if self.record:
+            x_history = np.array(self.x_history).reshape(-1, self.n)
+        else:
+            x_history = np.empty((0, self.n))
+        return LPResult(
+            status=status,
+            x=x[:self.n],
+            objective=float(self.c @ x[:self.n]),
+            duals=y,
+            reduced_costs=d[:self.n],
+            slack=x[self.n:],
+            basis=self.basis.copy(),
+            iterations=self.iterations,
+            z_history=np.array(self.z_history),
+            x_history=x_history,
+            basis_inverse=self.binv.copy(),
+        )
+
+
+def solve_lp(c, A, b, basis=None, basis_inverse=None, record=True, max_iter=None, progress=None):
+    """Resuelve ``max c·x, A x <= b, x >= 0``; ``basis`` permite arranque en caliente.
+
+    ``progress(iteración, objetivo)`` se llama después de cada pivote.
+    """
+    return RevisedSimplex(c, A, b, basis=basis, basis_inverse=basis_inverse,
+                          record=record, max_iter=max_iter, progress=progress).solve()
@@ -0,0 +1,121 @@
+"""Matriz de restricciones dispersa para catálogos grandes.
+
+``CSRMatrix`` guarda solo los no ceros (filas en CSR y una copia de índices
+en CSC para acceso por columna) y expone las operaciones que usa el simplex
+con la misma sintaxis que un ``ndarray``: ``A @ x``, ``y @ A``, ``Y @ A`` y
+``A[:, cols]``. Así el costo de precios y pivotes depende de los no ceros y
+no de productos × recursos.
+"""
+import numpy as np
+
+SPARSE_MIN_SIZE = 10_000
+SPARSE_MAX_DENSITY = 0.25
+
+
+class CSRMatrix:
+    # Hace que ``ndarray @ CSRMatrix`` delegue en __rmatmul__
+    __array_ufunc__ = None
+
+    def __init__(self, rows, cols, values, shape):
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        keep = values != 0
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+        self.shape = (int(shape[0]), int(shape[1]))
+        m, n = self.shape
+
+        order = np.lexsort((cols, rows))
+        self.row_ids = rows[order]
+        self.indices = cols[order]
+        self.data = values[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(self.row_ids, minlength=m))])
+
+        order = np.lexsort((rows, cols))
+        self.csc_rows = rows[order]
+        self.csc_cols = cols[order]
+        self.csc_data = values[order]
+        self.col_ptr = np.concatenate([[0], np.cumsum(np.bincount(self.csc_cols, minlength=n))])
+
+    @classmethod
+    def from_dense(cls, A):
+        A = np.asarray(A, dtype=float)
+        rows, cols = np.nonzero(A)
+        return cls(rows, cols, A[rows, cols], A.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def density(self):
+        return self.nnz / max(1, self.shape[0] * self.shape[1])
+
+    def toarray(self):
+        dense = np.zeros(self.shape)
+        dense[self.row_ids, self.indices] = self.data
+        return dense
+
+    def __matmul__(self, x):
+        x = np.asarray(x, dtype=float)
+        products = self.data * x[self.indices] if x.ndim == 1 else self.data[:, None] * x[self.indices]
+        if x.ndim == 1:
+            return np.bincount(self.row_ids, weights=products, minlength=self.shape[0])
+        out = np.zeros((self.shape[0], x.shape[1]))
+        np.add.at(out, self.row_ids, products)
+        return out
+
+    def __rmatmul__(self, y):
+        y = np.asarray(y, dtype=float)
+        if y.ndim == 1:
+            return np.bincount(self.indices, weights=self.data * y[self.row_ids], minlength=self.shape[1])
+        # Y @ A por columnas: suma segmentada sobre el orden CSC
+        products = y[:, self.csc_rows] * self.csc_data
+        out = np.zeros((y.shape[0], self.shape[1]))
+        nonempty = np.flatnonzero(np.diff(self.col_ptr) > 0)
+        if nonempty.size:
+            out[:, nonempty] = np.add.reduceat(products, self.col_ptr[nonempty], axis=1)
+        return out
+
+    def __getitem__(self, key):
+        rows, cols = key
+        if not (isinstance(rows, slice) and rows == slice(None)):
+            raise IndexError('CSRMatrix solo admite selección de columnas A[:, cols]')
+        if np.isscalar(cols):
+            column = np.zeros(self.shape[0])
+            start, stop = self.col_ptr[cols], self.col_ptr[cols + 1]
+            column[self.csc_rows[start:stop]] = self.csc_data[start:stop]
+            return column
+        cols = np.asarray(cols, dtype=np.int64)
+        out = np.zeros((self.shape[0], len(cols)))
+        counts = self.col_ptr[cols + 1] - self.col_ptr[cols]
+        positions = np.repeat(np.arange(len(cols)), counts)
+        starts = np.repeat(self.col_ptr[cols] - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+        entries = np.arange(counts.sum()) + starts
+        out[self.csc_rows[entries], positions] = self.csc_data[entries]
+        return out
+
+
+def as_matrix(A):
+    """Deja ``CSRMatrix`` tal cual y convierte lo demás a ``ndarray`` de floats."""
+    if isinstance(A, CSRMatrix):
+        return A
+    return np.asarray(A, dtype=float)
+
+
+def triplets(A):
+    """``(filas, columnas, valores)`` de los no ceros de ``A``."""
+    if isinstance(A, CSRMatrix):
+        return A.row_ids, A.indices, A.data
+    rows, cols = np.nonzero(A)
+    return rows, cols, A[rows, cols]
+
+
+def maybe_sparse(A):
+    """Usa la representación dispersa cuando la matriz es grande y mayormente ceros."""
+    A = as_matrix(A)
+    if isinstance(A, CSRMatrix) or A.size < SPARSE_MIN_SIZE:
+        return A
+    if np.count_nonzero(A) / A.size > SPARSE_MAX_DENSITY:
+        return A
+    return CSRMatrix.from_dense(A)
@@ -0,0 +1,164 @@
+"""Métricas del proceso en formato de texto de Prometheus.
+
+Histogramas y contadores mínimos (sin dependencias) más una función que
+instrumenta el ``server`` de Flask: duración y tamaño de respuesta de cada
+callback de Dash, por salida y pestaña, expuestos en ``/metrics``. Con
+``NVIDIA_TIMING_HEADER=1`` cada respuesta lleva además un ``Server-Timing``.
+
+Las métricas son por proceso: con varios workers de gunicorn cada uno expone
+las suyas.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+
+import flask
+
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000)
+ITERATION_BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class Histogram:
+    def __init__(self, name, help, buckets, labels=()):
+        self.name, self.help, self.buckets, self.labels = name, help, tuple(buckets), tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            counts, total = self._series.get(labels, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._series[labels] = (counts, total + value)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_labels(self.labels + ("le",), labels + (bound,))} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labels, labels)} {total}')
+            lines.append(f'{self.name}_count{_labels(self.labels, labels)} {cumulative}')
+        return lines
+
+
+class Gauge:
+    """Valor leído en el momento de la consulta: ``collect()`` devuelve ``{etiquetas: valor}``."""
+
+    def __init__(self, name, help, collect, labels=()):
+        self.name, self.help, self.collect, self.labels = name, help, collect, tuple(labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge']
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f'{self.name}{_labels(self.labels, labels)} {value}')
+        return lines
+
+
+REGISTRY = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render():
+    return '\n'.join(line for metric in REGISTRY for line in metric.render()) + '\n'
+
+
+CALLBACK_SECONDS = register(Histogram(
+    'dash_callback_duration_seconds', 'Duración de los callbacks de Dash', TIME_BUCKETS, ('output', 'tab')))
+CALLBACK_BYTES = register(Histogram(
+    'dash_callback_response_bytes', 'Tamaño de la respuesta de los callbacks', SIZE_BUCKETS, ('output', 'tab')))
+SOLVER_SECONDS = register(Histogram(
+    'lp_solve_duration_seconds', 'Duración de las resoluciones del simplex', TIME_BUCKETS, ('kind',)))
+SOLVER_ITERATIONS = register(Histogram(
+    'lp_solve_iterations', 'Pivotes por resolución del simplex', ITERATION_BUCKETS, ('kind',)))
+
+
+STARTUP = {}
+register(Gauge('app_startup_seconds', 'Arranque del worker: import de la app y primera respuesta del layout',
+               lambda: {(phase,): seconds for phase, seconds in STARTUP.items()}, ('phase',)))
+
+
+def mark_startup(phase, seconds):
+    STARTUP.setdefault(phase, seconds)
+
+
+def observe_solve(kind, seconds, iterations):
+    SOLVER_SECONDS.observe(seconds, kind)
+    SOLVER_ITERATIONS.observe(iterations, kind)
+
+
+def cache_ratio(caches):
+    """Gauge de aciertos/(aciertos+fallos) para objetos con atributos ``hits`` y ``misses``."""
+    def collect():
+        values = {}
+        for name, cache in caches.items():
+            total = cache.hits + cache.misses
+            values[(name,)] = cache.hits / total if total else 0.0
+        return values
+    return register(Gauge('cache_hit_ratio', 'Proporción de aciertos por caché', collect, ('cache',)))
+
+
+def _callback_labels(body):
+    output = body.get('output', '')
+    tab = ''
+    for item in body.get('inputs', []):
+        if isinstance(item, dict) and item.get('id') in ('tabs', 'pending-tab'):
+            tab = item.get('value') or ''
+    return output, tab
+
+
+def instrument(server, timing_header=None):
+    """Mide cada petición de ``server`` y publica ``/metrics``."""
+    if timing_header is None:
+        timing_header = os.environ.get('NVIDIA_TIMING_HEADER') == '1'
+
+    @server.before_request
+    def _start_timer():
+        flask.g.metrics_start = time.perf_counter()
+
+    @server.after_request
+    def _record(response):
+        start = getattr(flask.g, 'metrics_start', None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        # La primera respuesta que cuenta es la del layout, no la de cualquier petición que llegue antes
+        if 'first_layout' not in STARTUP and flask.request.path.endswith('/_dash-layout'):
+            mark_startup('first_layout', elapsed)
+        if flask.request.path.endswith('/_dash-update-component'):
+            try:
+                body = json.loads(flask.request.get_data(cache=True) or b'{}')
+            except ValueError:
+                body = {}
+            labels = _callback_labels(body)
+            CALLBACK_SECONDS.observe(elapsed, *labels)
+            if not response.direct_passthrough:
+                CALLBACK_BYTES.observe(response.calculate_content_length() or 0, *labels)
+        if timing_header:
+            response.headers.add('Server-Timing', f'app;dur={elapsed * 1000:.1f}')
+        return response
+
+    @server.route('/metrics')
+    def _metrics():
+        return flask.Response(render(), mimetype='text/plain; version=0.0.4')
+
+    return server
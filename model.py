@@ -0,0 +1,314 @@
+"""Construcción del modelo lineal a partir de los DataFrames del dashboard.
+
+Toma precios, costos, disponibilidades y coeficientes de consumo, resuelve con
+el simplex de ``lp`` y devuelve las tablas que muestran las pestañas.
+"""
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from lp import (
+    IntegerResult, LPResult, Ranging, SharedStore, SolutionCache, branch_and_bound, compute_ranging,
+    lp_hash, rhs_parametric, solve_batch, solve_lp, solve_presolved,
+)
+from lp.sparse import CSRMatrix, maybe_sparse
+from metrics import observe_solve
+
+# Por encima de este número de productos no se guarda x en cada iteración
+RECORD_LIMIT = 50
+# Monte Carlo: celdas (sorteos × columnas) por bloque, tope de sorteos × productos y cuantiles del mix
+MONTE_CARLO_CHUNK = 500_000
+MONTE_CARLO_CELLS = 5_000_000
+MONTE_CARLO_MIN_DRAWS = 200
+MONTE_CARLO_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Soluciones ya calculadas por huella del LP; NVIDIA_CACHE_DIR agrega un nivel en disco y
+# NVIDIA_SHARED_DIR (p. ej. en /dev/shm) uno en memoria compartida entre workers
+shared_store = SharedStore.from_env()
+solution_cache = SolutionCache(directory=os.environ.get('NVIDIA_CACHE_DIR'), shared=shared_store)
+
+
+@dataclass
+class ModelSolution:
+    production_data: pd.DataFrame
+    resource_data: pd.DataFrame
+    shadow_prices: pd.DataFrame
+    simplex_data: pd.DataFrame
+    sensitivity_data: pd.DataFrame
+    result: LPResult
+    ranging: Ranging
+    c: np.ndarray
+    A: np.ndarray | CSRMatrix
+    b: np.ndarray
+    integer: IntegerResult | None = None
+
+
+def model_version(*frames):
+    """Huella estable del contenido de los DataFrames, usada como versión de datos."""
+    digest = hashlib.sha1()
+    for frame in frames:
+        digest.update(','.join(map(str, frame.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def build_lp(production_data, resource_data, consumption_data):
+    products = list(production_data['Producto'])
+    c = (production_data['Precio'] - production_data['Costo']).to_numpy(dtype=float)
+    b = resource_data['Disponible'].to_numpy(dtype=float)
+    if 'Consumo' in consumption_data.columns:
+        # Formato largo (Recurso, Producto, Consumo): se arma directo en forma dispersa
+        rows = pd.Index(resource_data['Recurso']).get_indexer(consumption_data['Recurso'])
+        cols = pd.Index(products).get_indexer(consumption_data['Producto'])
+        A = CSRMatrix(rows, cols, consumption_data['Consumo'], (len(b), len(c)))
+    else:
+        consumption = consumption_data.set_index('Recurso').loc[resource_data['Recurso'], products]
+        A = maybe_sparse(consumption.to_numpy(dtype=float))
+    return c, A, b
+
+
+def solve_model(production_data, resource_data, consumption_data, progress=None, integer=False, engine='auto'):
+    """Resuelve el modelo; con ``integer`` las cantidades salen de ramificación y acotamiento.
+
+    ``engine`` elige simplex, punto interior o, con 'auto', según el tamaño del modelo.
+
+    Precios sombra, rangos y bitácora del simplex son siempre los de la relajación lineal.
+    """
+    c, A, b = _shared_lp(*build_lp(production_data, resource_data, consumption_data))
+    solve = lambda: solve_presolved(c, A, b, engine, record=len(c) <= RECORD_LIMIT, progress=progress)
+    return _solution(production_data, resource_data, c, A, b, solve, integer, variant=engine)
+
+
+def reoptimize(solution, product=None, price=None, cost=None, resource=None, available=None):
+    """Vuelve a optimizar tras cambiar el precio/costo de un producto o la disponibilidad de un recurso.
+
+    Arranca desde la base óptima guardada en ``solution``: un cambio de costo
+    deja la base primal factible (sigue el simplex primal) y uno de
+    disponibilidad la deja dual factible (sigue el simplex dual), así que
+    suelen bastar unos pocos pivotes.
+    """
+    production_data = solution.production_data.copy()
+    resource_data = solution.resource_data.copy()
+    if product is not None:
+        rows = production_data['Producto'] == product
+        if not rows.any():
+            raise KeyError(f'Producto desconocido: {product}')
+        if price is not None:
+            production_data.loc[rows, 'Precio'] = price
+        if cost is not None:
+            production_data.loc[rows, 'Costo'] = cost
+    if resource is not None:
+        rows = resource_data['Recurso'] == resource
+        if not rows.any():
+            raise KeyError(f'Recurso desconocido: {resource}')
+        if available is not None:
+            resource_data.loc[rows, 'Disponible'] = available
+
+    c = (production_data['Precio'] - production_data['Costo']).to_numpy(dtype=float)
+    b = resource_data['Disponible'].to_numpy(dtype=float)
+    base = solution.result
+    solve = lambda: solve_lp(c, solution.A, b, basis=base.basis, basis_inverse=base.basis_inverse,
+                             record=len(c) <= RECORD_LIMIT)
+    # El camino (y la bitácora) depende de la base de arranque: va en la clave de la caché
+    variant = 'simplex@' + hashlib.sha1(np.ascontiguousarray(base.basis).tobytes()).hexdigest()[:16]
+    return _solution(production_data, resource_data, c, solution.A, b, solve, solution.integer is not None, variant)
+
+
+def _shared_lp(c, A, b):
+    """Coeficientes del modelo como vistas de la copia en memoria compartida, si la hay."""
+    if shared_store is None:
+        return c, A, b
+    key = lp_hash(c, A, b) + ':modelo'
+    shared = shared_store.get(key)
+    if shared is None:
+        shared_store.put(key, (c, A, b))
+        shared = shared_store.get(key)
+    return shared if shared is not None else (c, A, b)
+
+
+def _solve_cached(c, A, b, solve, variant):
+    """Resultado y rangos por huella del LP y ``variant`` (motor o arranque): cada camino guarda su bitácora."""
+    def compute():
+        start = time.perf_counter()
+        result = solve()
+        observe_solve('lp', time.perf_counter() - start, result.iterations)
+        return result, compute_ranging(c, A, b, result) if result.optimal else None
+    return solution_cache.get_or_compute(f'{lp_hash(c, A, b)}:{variant}', compute)
+
+
+def _branch_and_bound(c, A, b, root):
+    start = time.perf_counter()
+    mip = branch_and_bound(c, A, b, root=root)
+    observe_solve('entero', time.perf_counter() - start, mip.nodes)
+    return mip
+
+
+def _solve_batch(solution, **variants):
+    start = time.perf_counter()
+    batch = solve_batch(solution.c, solution.A, solution.b, solution.result, **variants)
+    observe_solve('lote', time.perf_counter() - start, int(batch.iterations.sum()))
+    return batch
+
+
+def _solution(production_data, resource_data, c, A, b, solve, integer=False, variant='auto'):
+    result, ranging = _solve_cached(c, A, b, solve, variant)
+    if not result.optimal:
+        raise ValueError(f'El modelo de producción no tiene óptimo: {result.status}')
+
+    mip = None
+    x = result.x
+    if integer:
+        mip = solution_cache.get_or_compute(lp_hash(c, A, b) + ':entero', lambda: _branch_and_bound(c, A, b, result))
+        if not np.isfinite(mip.objective):
+            raise ValueError(f'El modelo entero no tiene solución: {mip.status}')
+        x = mip.x
+    x = np.round(x, 2)
+    production = production_data.copy()
+    production['Unitaria'] = c
+    production['Cantidad'] = x
+    production['Utilidad'] = np.round(c * x, 2)
+
+    used = np.round(A @ x, 2)
+    resources = resource_data.copy()
+    resources['Usado'] = used
+    resources['Porcentaje'] = np.round(np.divide(used, b, out=np.zeros_like(used), where=b > 0) * 100, 1)
+
+    # Rangos de costos y de lados derechos desde la inversa de la base
+    resources['Minimo'] = np.round(ranging.rhs_lower, 2)
+    resources['Maximo'] = np.round(ranging.rhs_upper, 2)
+
+    duals = np.round(result.duals, 2)
+    shadow = pd.DataFrame({
+        'Recurso': resource_data['Recurso'],
+        'Precio': duals,
+        'Impacto': np.where(duals > 0, 'Crítico', 'Nulo')
+    })
+
+    history = result.x_history if len(result.x_history) else np.empty((len(result.z_history), 0))
+    simplex = pd.DataFrame(np.round(history, 2), columns=[f'x{j + 1}' for j in range(history.shape[1])])
+    simplex.insert(0, 'Z', np.round(result.z_history / 1e6, 2))
+    simplex.insert(0, 'Iteracion', np.arange(len(simplex)))
+
+    sensitivity = sensitivity_table(production, ranging)
+
+    return ModelSolution(production, resources, shadow, simplex, sensitivity, result, ranging, c, A, b, mip)
+
+
+def sensitivity_table(production, ranging, stable_margin=0.10):
+    actual = production['Unitaria'].to_numpy(dtype=float)
+    lower = np.maximum(ranging.cost_lower, 0.0)
+    upper = ranging.cost_upper
+    with np.errstate(divide='ignore', invalid='ignore'):
+        down = (actual - lower) / actual
+        up = (upper - actual) / actual
+    margin = np.minimum(down, up)
+    wide = ~np.isfinite(up) | ~np.isfinite(margin) | (margin > 1.0)
+    return pd.DataFrame({
+        'Producto': production['Producto'],
+        'Actual': actual,
+        'Minimo': np.round(lower, 2),
+        'Maximo': np.round(upper, 2),
+        'Rango': np.where(wide, 'Amplio', [f"±{v:.0%}" if np.isfinite(v) else '' for v in margin]),
+        'Estable': np.where(margin >= stable_margin, '✓', '✗'),
+    })
+
+
+def _resource_mask(resource_data, resource):
+    mask = resource_data['Recurso'].to_numpy() == resource
+    if not mask.any():
+        raise KeyError(f'Recurso desconocido: {resource}')
+    return mask
+
+
+def _rhs_factors(resource_data, factors):
+    scale = np.ones(len(resource_data))
+    for resource, factor in factors.items():
+        scale[_resource_mask(resource_data, resource)] = factor
+    return scale
+
+
+def evaluate_scenarios(solution, definitions):
+    """Resuelve en lote escenarios ``(nombre, {recurso: factor})`` sobre la base óptima."""
+    resources = solution.resource_data
+    rhs = np.array([solution.b * _rhs_factors(resources, factors) for name, factors in definitions])
+    batch = _solve_batch(solution, rhs=rhs)
+    table = pd.DataFrame({
+        'Escenario': [name for name, factors in definitions],
+        'Utilidad': np.round(batch.objective / 1e6, 2),
+        'Produccion': np.round(batch.x.sum(axis=1), 2),
+        'Estado': batch.status,
+    })
+    for j, resource in enumerate(resources['Recurso']):
+        table[resource] = rhs[:, j]
+    return table
+
+
+def scenario_grid(solution, row_resource, col_resource, factors):
+    """Utilidad óptima (M$) para cada combinación de factores de dos recursos."""
+    resources = solution.resource_data
+    factors = np.asarray(factors, dtype=float)
+    rows, cols = np.meshgrid(factors, factors, indexing='ij')
+    scale = np.ones((rows.size, len(resources)))
+    scale[:, _resource_mask(resources, row_resource)] = rows.reshape(-1, 1)
+    scale[:, _resource_mask(resources, col_resource)] = cols.reshape(-1, 1)
+    batch = _solve_batch(solution, rhs=solution.b * scale)
+    profit = np.where(batch.status == 'optimal', batch.objective / 1e6, np.nan)
+    return pd.DataFrame(profit.reshape(rows.shape), index=factors, columns=factors)
+
+
+def parametric_curve(solution, resource, upper_factor=3.0):
+    """Utilidad óptima exacta al variar la disponibilidad de ``resource`` entre 0 y ``upper_factor`` veces."""
+    row = int(np.flatnonzero(solution.resource_data['Recurso'].to_numpy() == resource)[0])
+    return rhs_parametric(solution.c, solution.A, solution.b, solution.result, row, 0.0, upper_factor * solution.b[row])
+
+
+def monte_carlo(solution, draws=2000, price_sd=0.10, cost_sd=0.05, capacity_sd=0.10, seed=0, products=(),
+                processes=None, progress=None):
+    """Utilidad óptima de hasta ``draws`` sorteos de precios, costos y disponibilidades.
+
+    Cada parámetro se multiplica por ``1 + sd·Z`` con ``Z`` normal estándar
+    (truncado en cero). Los sorteos se resuelven en lote desde la base óptima,
+    en bloques de a lo sumo MONTE_CARLO_CHUNK celdas, y de cada bloque solo se
+    guarda la utilidad por sorteo y la cantidad de los ``products`` pedidos:
+    la memoria no crece con sorteos × productos. Con catálogos grandes los
+    sorteos se limitan a MONTE_CARLO_CELLS / productos. Devuelve un
+    diccionario con ``draws``, ``warm_hits``, ``profit`` (M$ por sorteo),
+    ``quantiles`` y ``mix`` (cuantiles de la cantidad de cada producto pedido).
+    """
+    rng = np.random.default_rng(seed)
+    production = solution.production_data
+    price = production['Precio'].to_numpy(dtype=float)
+    cost = production['Costo'].to_numpy(dtype=float)
+    m, n = len(solution.b), len(price)
+    draws = int(min(draws, max(MONTE_CARLO_MIN_DRAWS, MONTE_CARLO_CELLS // max(n, 1))))
+    chunk = max(1, MONTE_CARLO_CHUNK // (n + m))
+    columns = pd.Index(production['Producto']).get_indexer(list(products))
+    if (columns < 0).any():
+        raise KeyError(f'Producto desconocido: {list(products)[int(np.argmin(columns))]}')
+    factor = lambda sd, size: np.maximum(1.0 + sd * rng.standard_normal(size), 0.0)
+
+    profit = np.empty(draws)
+    mix = np.empty((draws, len(columns)))
+    warm_hits = 0
+    for first in range(0, draws, chunk):
+        size = min(chunk, draws - first)
+        costs = price * factor(price_sd, (size, n)) - cost * factor(cost_sd, (size, n))
+        rhs = solution.b * factor(capacity_sd, (size, m))
+        batch = _solve_batch(solution, costs=costs, rhs=rhs, processes=processes)
+        profit[first:first + size] = batch.objective / 1e6
+        mix[first:first + size] = batch.x[:, columns]
+        warm_hits += batch.warm_hits
+        if progress is not None:
+            progress(first + size, None)
+    quantiles = np.quantile(mix, MONTE_CARLO_QUANTILES, axis=0) if draws else np.zeros((len(MONTE_CARLO_QUANTILES), len(columns)))
+    return {
+        'draws': draws,
+        'warm_hits': warm_hits,
+        'profit': np.round(profit, 4),
+        'quantiles': list(MONTE_CARLO_QUANTILES),
+        'mix': {name: np.round(quantiles[:, j], 2) for j, name in enumerate(products)},
+    }
@@ -0,0 +1,163 @@
+"""Planeación de producción en varios periodos con horizonte rodante.
+
+Cada periodo repite la estructura del modelo mensual (mismos productos, mismos
+coeficientes de consumo) con su propia disponibilidad de recursos, y se enlaza
+con el siguiente por el inventario que pasa de un mes a otro:
+
+    venta_t = inventario_{t-1} + producción_t - inventario_t >= 0
+
+En lugar de resolver un LP monolítico de todo el horizonte, se resuelve una
+ventana de ``window`` periodos, se fija la decisión del primero y la ventana
+avanza un mes. Cada ventana arranca desde la base óptima de la anterior,
+desplazada un periodo, así que solo se repara lo que cambió.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from lp import solve_lp
+from lp.sparse import CSRMatrix
+from model import build_lp
+
+
+@dataclass
+class PlanResult:
+    plan: pd.DataFrame
+    periods: pd.DataFrame
+    profit: float
+    iterations: int
+
+
+def _period_values(frame, key, keys, column, periods, default):
+    """Matriz (periodos, claves) desde un DataFrame largo ``Periodo, <key>, <column>``."""
+    values = np.tile(np.asarray(default, dtype=float), (periods, 1))
+    if frame is None:
+        return values
+    rows = frame['Periodo'].to_numpy(dtype=int) - 1
+    cols = pd.Index(keys).get_indexer(frame[key])
+    if (cols < 0).any() or (rows < 0).any() or (rows >= periods).any():
+        raise ValueError(f'{column}: periodo o {key.lower()} fuera del modelo')
+    values[rows, cols] = frame[column].to_numpy(dtype=float)
+    return values
+
+
+def build_window(price, cost, holding, A, supply, demand, initial):
+    """LP de una ventana: variables ``[producción_k, inventario_k]`` por periodo ``k``.
+
+    Filas por periodo: recursos (``A x_k <= b_k``), disponibilidad para vender
+    (``s_k - s_{k-1} - x_k <= 0``) y, si hay demanda, su tope
+    (``x_k + s_{k-1} - s_k <= d_k``). El inventario inicial pasa al lado derecho.
+    """
+    T, m = supply.shape
+    n = len(price)
+    rows_per = m + n + (n if demand is not None else 0)
+    A_rows, A_cols = (A.row_ids, A.indices) if isinstance(A, CSRMatrix) else np.nonzero(A)
+    A_data = A.data if isinstance(A, CSRMatrix) else A[A_rows, A_cols]
+    eye = np.arange(n)
+
+    rows, cols, data, rhs = [], [], [], []
+    for k in range(T):
+        row0, x0, s0, prev = k * rows_per, 2 * n * k, 2 * n * k + n, 2 * n * (k - 1) + n
+        rows += [row0 + A_rows, row0 + m + eye, row0 + m + eye]
+        cols += [x0 + A_cols, s0 + eye, x0 + eye]
+        data += [A_data, np.ones(n), -np.ones(n)]
+        carried = initial if k == 0 else np.zeros(n)
+        if k > 0:
+            rows.append(row0 + m + eye)
+            cols.append(prev + eye)
+            data.append(-np.ones(n))
+        rhs += [supply[k], carried]
+        if demand is not None:
+            base = row0 + m + n
+            rows += [base + eye, base + eye]
+            cols += [x0 + eye, s0 + eye]
+            data += [np.ones(n), -np.ones(n)]
+            if k > 0:
+                rows.append(base + eye)
+                cols.append(prev + eye)
+                data.append(np.ones(n))
+            rhs.append(demand[k] - carried)
+
+    # Objetivo: venta a precio, producción a costo, inventario con costo de mantener
+    c = np.zeros(2 * n * T)
+    for k in range(T):
+        c[2 * n * k:2 * n * k + n] = price - cost
+        c[2 * n * k + n:2 * n * (k + 1)] = -price - holding + (price if k + 1 < T else 0.0)
+    matrix = CSRMatrix(np.concatenate(rows), np.concatenate(cols), np.concatenate(data), (rows_per * T, 2 * n * T))
+    return c, matrix, np.concatenate(rhs), rows_per
+
+
+def _shift_basis(basis, n_vars, rows_per, n, periods, size):
+    """Base de la ventana anterior corrida un periodo hacia atrás, completada con holguras."""
+    if basis is None:
+        return None
+    structural = basis < n_vars
+    period = np.where(structural, basis // (2 * n), (basis - n_vars) // rows_per)
+    keep = (period >= 1) & (period <= periods)
+    new_vars = 2 * n * periods
+    shifted = np.where(structural, basis - 2 * n, basis - n_vars - rows_per + new_vars)[keep]
+    # Se completa con holguras libres, empezando por las filas del periodo nuevo
+    used_rows = np.zeros(size, dtype=bool)
+    used_rows[shifted[shifted >= new_vars] - new_vars] = True
+    free = new_vars + np.flatnonzero(~used_rows)[::-1]
+    needed = size - len(shifted)
+    if needed < 0 or needed > len(free):
+        return None
+    return np.concatenate([shifted, free[:needed]])
+
+
+def rolling_horizon(production_data, resource_data, consumption_data, periods=12, window=3,
+                    supply_data=None, demand_data=None, holding_rate=0.02, initial=None):
+    """Plan de ``periods`` meses resolviendo ventanas de ``window`` meses.
+
+    ``supply_data`` (Periodo, Recurso, Disponible) y ``demand_data`` (Periodo,
+    Producto, Demanda) son opcionales; sin ellos cada mes repite la
+    disponibilidad base y las ventas no tienen tope.
+    """
+    _, A, base_supply = build_lp(production_data, resource_data, consumption_data)
+    products = production_data['Producto'].to_numpy()
+    price = production_data['Precio'].to_numpy(dtype=float)
+    cost = production_data['Costo'].to_numpy(dtype=float)
+    holding = holding_rate * cost
+    n = len(products)
+    supply = _period_values(supply_data, 'Recurso', resource_data['Recurso'], 'Disponible', periods, base_supply)
+    demand = None
+    if demand_data is not None:
+        demand = _period_values(demand_data, 'Producto', products, 'Demanda', periods, np.full(n, np.inf))
+        demand = np.where(np.isfinite(demand), demand, 1e12)
+
+    inventory = np.zeros(n) if initial is None else np.asarray(initial, dtype=float)
+    basis, previous = None, None
+    records, summary, total_iterations = [], [], 0
+    for t in range(periods):
+        span = min(window, periods - t)
+        c, A_window, b, rows_per = build_window(price, cost, holding, A, supply[t:t + span],
+                                                None if demand is None else demand[t:t + span], inventory)
+        warm = None
+        if previous is not None:
+            warm = _shift_basis(basis, previous, rows_per, n, span, A_window.shape[0])
+        result = solve_lp(c, A_window, b, basis=warm, record=False)
+        if not result.optimal:
+            raise ValueError(f'Periodo {t + 1}: la ventana no tiene óptimo ({result.status})')
+        basis, previous = result.basis, A_window.shape[1]
+        total_iterations += result.iterations
+
+        produced, stored = result.x[:n], result.x[n:2 * n]
+        sold = np.maximum(inventory + produced - stored, 0.0)
+        profit = price * sold - cost * produced - holding * stored
+        records.append(pd.DataFrame({
+            'Periodo': t + 1,
+            'Producto': products,
+            'Produccion': np.round(produced, 2),
+            'Venta': np.round(sold, 2),
+            'Inventario': np.round(stored, 2),
+            'Utilidad': np.round(profit, 2),
+        }))
+        summary.append({'Periodo': t + 1, 'Utilidad': profit.sum(), 'Iteraciones': result.iterations,
+                        'Arranque': 'caliente' if warm is not None else 'frío'})
+        inventory = stored
+
+    plan = pd.concat(records, ignore_index=True)
+    periods_table = pd.DataFrame(summary)
+    return PlanResult(plan, periods_table, float(periods_table['Utilidad'].sum()), total_iterations)
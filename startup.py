@@ -0,0 +1,129 @@
+"""Arranque rápido de los workers: imports diferidos y artefactos precomputados.
+
+    python startup.py                 # construye las pestañas y guarda los artefactos
+    python startup.py --measure       # solo mide import y primera respuesta
+
+Los artefactos son los layouts de cada pestaña y las figuras ya serializadas,
+guardados en ``NVIDIA_ARTIFACT_DIR`` (``artifacts/`` por defecto) con la
+versión de datos y una huella del código que arma los layouts (y del solver
+que calcula sus cifras) en el nombre.
+Cada worker los carga al importar ``app`` en lugar de reconstruirlos; si
+cambiaron los datos o ese código el nombre no coincide y se construyen como
+siempre. Con ``gunicorn --preload`` la carga ocurre una sola
+vez en el master y los workers heredan las cachés.
+"""
+import argparse
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from lp._io import atomic_write
+
+ARTIFACT_DIR = os.environ.get('NVIDIA_ARTIFACT_DIR', 'artifacts')
+# Módulos que determinan el contenido de layouts y figuras, incluido el solver que da las cifras
+LAYOUT_SOURCES = ('app.py', 'tables.py', 'layout_cache.py', 'model.py', 'lp/*.py')
+
+
+def lazy_import(name):
+    """Módulo que se importa de verdad en el primer acceso a un atributo."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """Huella de ``LAYOUT_SOURCES``: un cambio en el código que arma las pestañas o en el solver invalida los artefactos."""
+    digest = hashlib.sha1()
+    root = Path(__file__).resolve().parent
+    for pattern in LAYOUT_SOURCES:
+        for path in sorted(root.glob(pattern)):
+            digest.update(path.relative_to(root).as_posix().encode() + b'\0' + path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def artifact_path(version, directory=None):
+    return Path(directory or ARTIFACT_DIR) / f'layouts-{version}-{code_version()}.json'
+
+
+def save_artifacts(version, caches, directory=None):
+    """Guarda las entradas de cada ``LayoutCache`` de ``caches`` ({nombre: caché})."""
+    path = artifact_path(version, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {'version': version, 'code': code_version(), **{name: cache.export(version) for name, cache in caches.items()}}
+    with atomic_write(path, 'w', encoding='utf-8', permissions=0o644) as handle:
+        json.dump(payload, handle, ensure_ascii=False, separators=(',', ':'))
+    return path
+
+
+def load_artifacts(version, caches, directory=None):
+    """Carga los artefactos de ``version`` en las cachés; devuelve cuántas entradas cargó."""
+    path = artifact_path(version, directory)
+    try:
+        with open(path, encoding='utf-8') as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return 0
+    if payload.get('version') != version or payload.get('code') != code_version():
+        return 0
+    return sum(cache.load(version, payload.get(name, {})) for name, cache in caches.items())
+
+
+_MEASURE = '''
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.server.test_client()
+client.get('/')
+output = next(key for key, spec in app.app.callback_map.items()
+              if getattr(spec.get('callback'), '__name__', None) == 'render_content')
+client.post('/_dash-update-component', json={
+    'output': output,
+    'outputs': [{'id': {'tab': name, 'type': 'tab-panel'}, 'property': 'children'} for name in app.TABS],
+    'inputs': [{'id': 'pending-tab', 'property': 'data', 'value': app.TABS[0]}],
+    'changedPropIds': ['pending-tab.data'], 'state': []})
+print(json.dumps({'import_s': round(imported - start, 3), 'first_response_s': round(time.perf_counter() - imported, 3),
+                  'artifacts': app.artifact_entries}))
+'''
+
+
+def measure(artifacts=True):
+    """Tiempo de import de ``app`` y de la primera respuesta en un proceso nuevo, como un worker recién creado."""
+    env = dict(os.environ)
+    if not artifacts:
+        env['NVIDIA_ARTIFACT_DIR'] = tempfile.mkdtemp()
+    output = subprocess.run([sys.executable, '-c', _MEASURE], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).resolve().parent, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--measure', action='store_true', help='solo medir el arranque')
+    args = parser.parse_args()
+    if not args.measure:
+        import app
+
+        start = time.perf_counter()
+        app.layout_cache.warm(app.TABS, app.data_version, app.build_tab)
+        path = save_artifacts(app.data_version, app.startup_caches)
+        print(f'{path} ({time.perf_counter() - start:.2f} s)')
+    print(json.dumps({'sin artefactos': measure(False), 'con artefactos': measure(True)}, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()